@@ -24,4 +24,12 @@ echo "4️⃣  Full Pipeline"
 python test_full_pipeline.py
 echo ""
 
+echo "5️⃣  Consensus Parser"
+python test_consensus_parser.py
+echo ""
+
+echo "6️⃣  Research Cache"
+python test_research_cache.py
+echo ""
+
 echo "✅ All tests complete"
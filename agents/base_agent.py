@@ -2,20 +2,38 @@
 Base agent capabilities using composition pattern
 No inheritance chains - agents compose capabilities as needed
 """
+import asyncio
+import hashlib
+import json
+import threading
 import uuid
-from typing import Optional, Dict, Any, List, Union
+from typing import Optional, Dict, Any, List, Tuple, Union, AsyncIterator
 from abc import ABC, abstractmethod
-from anthropic import Anthropic
+import httpx
+from anthropic import AsyncAnthropic
 from loguru import logger
 from config import settings
-from services.redis_service import RedisService
+from services.redis_service import RedisService, loads as redis_loads
+from services.research_cache import is_cacheable_research
+
+# Semantic cache partition for condition research
+RESEARCH_SEMANTIC_CACHE = "research:condition"
+
+# Condition research semantic cache statistics (process-wide)
+research_cache_hits = 0
+research_cache_misses = 0
 
 
 class ResearchCapability:
     """Mixin for web research functionality via Parallel.ai or fallback service"""
 
-    def __init__(self, parallel_service: Any):  # Accepts ParallelService or FallbackResearchService
+    def __init__(
+        self,
+        parallel_service: Any,  # Accepts ParallelService or FallbackResearchService
+        redis_service: Optional[RedisService] = None,
+    ):
         self.parallel_service = parallel_service
+        self.research_cache = redis_service if settings.research_semantic_cache else None
 
     async def research_web(
         self,
@@ -33,42 +51,370 @@ class ResearchCapability:
     ) -> Dict[str, Any]:
         """Deep research on specific condition"""
         logger.debug(f"Deep research on condition: {condition}")
-        return await self.parallel_service.research_condition(condition, symptom_context)
+        cached = await self._get_cached_research(condition, symptom_context)
+        if cached is not None:
+            return cached
+
+        research = await self.parallel_service.research_condition(condition, symptom_context)
+        await self._cache_research(condition, symptom_context, research)
+        return research
+
+    async def research_conditions_details_batch(
+        self,
+        conditions: List[str],
+        symptom_context: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Deep research on several conditions, concurrently (via the service's research_conditions when it has one)"""
+        logger.debug(f"Deep research on {len(conditions)} conditions")
+        cached = await asyncio.gather(
+            *(self._get_cached_research(c, symptom_context) for c in conditions)
+        )
+        research = {c: r for c, r in zip(conditions, cached) if r is not None}
+        missing = [c for c in conditions if c not in research]
+        if not missing:
+            return research
+
+        research_conditions = getattr(self.parallel_service, "research_conditions", None)
+        if research_conditions:
+            fetched = await research_conditions(missing, symptom_context)
+        else:
+            researched = await asyncio.gather(
+                *(self.parallel_service.research_condition(c, symptom_context) for c in missing)
+            )
+            fetched = dict(zip(missing, researched))
+
+        await asyncio.gather(
+            *(self._cache_research(c, symptom_context, fetched[c]) for c in missing)
+        )
+        research.update(fetched)
+        return {c: research[c] for c in conditions}
+
+    async def _get_cached_research(
+        self,
+        condition: str,
+        symptom_context: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Research cached for a semantically equivalent condition query, when enabled"""
+        global research_cache_hits, research_cache_misses
+
+        if not self.research_cache:
+            return None
+
+        # Embedding the query is CPU-bound - keep it off the event loop
+        cached = await asyncio.to_thread(
+            self.research_cache.semantic_lookup,
+            RESEARCH_SEMANTIC_CACHE,
+            self._research_cache_text(condition, symptom_context),
+            settings.research_cache_similarity_threshold,
+        )
+        if cached is None:
+            research_cache_misses += 1
+            return None
+
+        research_cache_hits += 1
+        logger.debug(f"Research cache hit ({research_cache_hits} hits / {research_cache_misses} misses)")
+        # The match may be a differently-worded name for the same condition
+        return {**json.loads(cached), "condition": condition}
+
+    async def _cache_research(
+        self,
+        condition: str,
+        symptom_context: Optional[str],
+        research: Dict[str, Any],
+    ) -> None:
+        """Store successful research in the semantic cache, when enabled"""
+        if not self.research_cache or not is_cacheable_research(research):
+            return
+
+        await asyncio.to_thread(
+            self.research_cache.semantic_store,
+            RESEARCH_SEMANTIC_CACHE,
+            self._research_cache_text(condition, symptom_context),
+            json.dumps(research),
+        )
+
+    @staticmethod
+    def _research_cache_text(condition: str, symptom_context: Optional[str]) -> str:
+        """Text embedded for semantic lookup (symptom context trimmed as in the query)"""
+        return f"{condition}\n{symptom_context[:100]}" if symptom_context else condition
+
+
+# LLM response cache statistics (process-wide)
+llm_cache_hits = 0
+llm_cache_misses = 0
 
 
 class ReasoningCapability:
     """Mixin for LLM-based reasoning functionality"""
 
-    def __init__(self, anthropic_client: Anthropic, model: str = None):
+    def __init__(
+        self,
+        anthropic_client: AsyncAnthropic,
+        model: str = None,
+        redis_service: Optional[RedisService] = None,
+    ):
         self.anthropic_client = anthropic_client
         self.model = model or settings.model_name
+        self.llm_cache = redis_service
 
     async def reason(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = None,
+        prompt_prefix: Optional[str] = None,
     ) -> str:
-        """Perform LLM reasoning without tools"""
+        """
+        Perform LLM reasoning without tools (cached in Redis by prompt hash)
+
+        prompt_prefix is a static lead-in shared across calls (e.g. a debate's research
+        findings); it is sent as its own content block marked for Anthropic prompt caching.
+        """
         logger.debug(f"LLM reasoning: {prompt[:100]}...")
 
+        system_prompt = system_prompt or "You are a medical research assistant."
+        temperature = temperature or settings.temperature
+
+        cache_key = self._llm_cache_key(prompt, system_prompt, temperature, prompt_prefix)
+        if cache_key:
+            cached = await self._get_cached_completion(cache_key, prompt, system_prompt, temperature, prompt_prefix)
+            if cached is not None:
+                return cached
+
         try:
-            response = self.anthropic_client.messages.create(
-                model=self.model,
-                max_tokens=settings.max_tokens,
-                temperature=temperature or settings.temperature,
-                system=system_prompt or "You are a medical research assistant.",
-                messages=[{"role": "user", "content": prompt}],
+            response = await self.anthropic_client.messages.create(
+                **self._message_params(prompt, system_prompt, temperature, prompt_prefix)
             )
 
             content = response.content[0].text
-            logger.debug(f"LLM response length: {len(content)} chars")
+            usage = response.usage
+            logger.debug(
+                f"LLM response length: {len(content)} chars "
+                f"(prompt cache read {usage.cache_read_input_tokens or 0} / "
+                f"write {usage.cache_creation_input_tokens or 0} tokens)"
+            )
+
+            if cache_key:
+                await self._cache_completion(cache_key, prompt, system_prompt, temperature, prompt_prefix, content)
+
             return content
 
         except Exception as e:
             logger.error(f"LLM reasoning failed: {e}")
             return f"Error: {str(e)}"
 
+    async def reason_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = None,
+        prompt_prefix: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream LLM reasoning text as it is generated
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            prompt_prefix: Optional static lead-in, marked for prompt caching
+
+        Yields:
+            Text chunks - a cache hit or failure yields a single chunk
+        """
+        logger.debug(f"LLM streaming: {prompt[:100]}...")
+
+        system_prompt = system_prompt or "You are a medical research assistant."
+        temperature = temperature or settings.temperature
+
+        cache_key = self._llm_cache_key(prompt, system_prompt, temperature, prompt_prefix)
+        if cache_key:
+            cached = await self._get_cached_completion(cache_key, prompt, system_prompt, temperature, prompt_prefix)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        try:
+            async with self.anthropic_client.messages.stream(
+                **self._message_params(prompt, system_prompt, temperature, prompt_prefix)
+            ) as stream:
+                async for text in stream.text_stream:
+                    chunks.append(text)
+                    yield text
+
+        except Exception as e:
+            logger.error(f"LLM streaming failed: {e}")
+            if not chunks:
+                yield f"Error: {str(e)}"
+            return
+
+        content = "".join(chunks)
+        logger.debug(f"LLM streamed response length: {len(content)} chars")
+
+        if cache_key:
+            await self._cache_completion(cache_key, prompt, system_prompt, temperature, prompt_prefix, content)
+
+    async def _get_cached_completion(
+        self,
+        cache_key: str,
+        prompt: str,
+        system_prompt: str,
+        temperature: float,
+        prompt_prefix: Optional[str],
+    ) -> Optional[str]:
+        """Exact-match cache lookup, falling back to the semantic cache when enabled"""
+        global llm_cache_hits, llm_cache_misses
+
+        # Redis calls block - run them off the event loop like the semantic lookups
+        cached = await asyncio.to_thread(self.llm_cache.get_llm_response, cache_key)
+
+        semantic_cache = self._llm_semantic_cache_name(system_prompt, temperature)
+        if cached is None and semantic_cache:
+            # Embedding the prompt is CPU-bound - keep it off the event loop
+            cached = await asyncio.to_thread(
+                self.llm_cache.semantic_lookup,
+                semantic_cache,
+                self._semantic_cache_text(prompt, prompt_prefix),
+                settings.redisvl_similarity_threshold,
+            )
+
+        if cached is None:
+            llm_cache_misses += 1
+            return None
+
+        llm_cache_hits += 1
+        logger.debug(f"LLM cache hit ({llm_cache_hits} hits / {llm_cache_misses} misses)")
+        return cached
+
+    async def _cache_completion(
+        self,
+        cache_key: str,
+        prompt: str,
+        system_prompt: str,
+        temperature: float,
+        prompt_prefix: Optional[str],
+        content: str,
+    ) -> None:
+        """Store a completion in the exact-match (and, when enabled, semantic) cache"""
+        await asyncio.to_thread(self.llm_cache.set_llm_response, cache_key, content, settings.llm_cache_ttl)
+
+        semantic_cache = self._llm_semantic_cache_name(system_prompt, temperature)
+        if semantic_cache:
+            await asyncio.to_thread(
+                self.llm_cache.semantic_store,
+                semantic_cache,
+                self._semantic_cache_text(prompt, prompt_prefix),
+                content,
+            )
+
+    def _llm_semantic_cache_name(self, system_prompt: str, temperature: float) -> Optional[str]:
+        """Semantic cache partition - only prompts sharing model, system prompt and temperature are comparable"""
+        if not settings.llm_semantic_cache:
+            return None
+
+        digest = hashlib.sha256(f"{self.model}|{temperature}|{system_prompt}".encode()).hexdigest()
+        return f"llm:{digest[:16]}"
+
+    @staticmethod
+    def _semantic_cache_text(prompt: str, prompt_prefix: Optional[str]) -> str:
+        """Text embedded for semantic lookup - the variable prompt leads, since embedders truncate"""
+        return f"{prompt}\n{prompt_prefix}" if prompt_prefix else prompt
+
+    def _message_params(
+        self,
+        prompt: str,
+        system_prompt: str,
+        temperature: float,
+        prompt_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build Messages API params with the static segments marked for prompt caching
+
+        The system prompt and optional prompt prefix carry ephemeral cache_control
+        breakpoints, so repeated calls reuse the server-side tokenized prefix.
+        Segments below the model's minimum cacheable length are simply not cached.
+        """
+        content: List[Dict[str, Any]] = []
+        if prompt_prefix:
+            content.append({"type": "text", "text": prompt_prefix, "cache_control": {"type": "ephemeral"}})
+        content.append({"type": "text", "text": prompt})
+
+        return {
+            "model": self.model,
+            "max_tokens": settings.max_tokens,
+            "temperature": temperature,
+            "system": [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+            "messages": [{"role": "user", "content": content}],
+        }
+
+    def _llm_cache_key(
+        self,
+        prompt: str,
+        system_prompt: str,
+        temperature: float,
+        prompt_prefix: Optional[str] = None,
+    ) -> Optional[str]:
+        """Content-addressed cache key, or None when caching doesn't apply"""
+        # LLM_CACHE_TTL=0 disables the cache; high-temperature calls are meant to vary
+        if not self.llm_cache or settings.llm_cache_ttl <= 0 or temperature > 0.7:
+            return None
+
+        digest = hashlib.sha256(
+            f"{system_prompt}\x1f{prompt_prefix or ''}\x1f{prompt}\x1f{temperature}".encode()
+        ).hexdigest()
+        return f"llm:{self.model}:{digest}"
+
+    async def reason_batch(
+        self,
+        requests: Dict[str, Tuple[str, Optional[str], Optional[float], Optional[str]]],
+    ) -> Dict[str, str]:
+        """
+        Run many prompts through the Message Batches API (half price, not interactive)
+
+        Args:
+            requests: {custom_id: (prompt, system_prompt, temperature, prompt_prefix)}
+
+        Returns:
+            {custom_id: response text} - failed requests map to an "Error: ..." string
+        """
+        if not requests:
+            return {}
+
+        logger.debug(f"LLM batch reasoning: {len(requests)} requests")
+
+        try:
+            batch = await self.anthropic_client.messages.batches.create(requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": self._message_params(
+                        prompt,
+                        system_prompt or "You are a medical research assistant.",
+                        temperature or settings.temperature,
+                        prompt_prefix,
+                    ),
+                }
+                for custom_id, (prompt, system_prompt, temperature, prompt_prefix) in requests.items()
+            ])
+
+            while batch.processing_status != "ended":
+                await asyncio.sleep(settings.batch_poll_interval)
+                batch = await self.anthropic_client.messages.batches.retrieve(batch.id)
+
+            responses = {}
+            async for entry in await self.anthropic_client.messages.batches.results(batch.id):
+                if entry.result.type == "succeeded":
+                    responses[entry.custom_id] = entry.result.message.content[0].text
+                else:
+                    responses[entry.custom_id] = f"Error: batch request {entry.result.type}"
+
+            logger.debug(f"LLM batch {batch.id} complete: {len(responses)} responses")
+            return responses
+
+        except Exception as e:
+            logger.error(f"LLM batch reasoning failed: {e}")
+            return {custom_id: f"Error: {str(e)}" for custom_id in requests}
+
     async def reason_with_context(
         self,
         prompt: str,
@@ -93,14 +439,70 @@ class MemoryCapability:
         self.redis_service = redis_service
         self.agent_id = agent_id
 
-    def remember(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
-        """Store information in agent memory"""
+    def remember(self, key: str, value: Union[str, Dict[str, Any], List[Any]], ttl: Optional[int] = None) -> bool:
+        """Store information in agent memory (dicts/lists are JSON-serialized)"""
         return self.redis_service.set_agent_memory(self.agent_id, key, value, ttl)
 
     def recall(self, key: str) -> Optional[str]:
         """Retrieve information from agent memory"""
         return self.redis_service.get_agent_memory(self.agent_id, key)
 
+    def recall_json(self, key: str) -> Optional[Any]:
+        """Retrieve a structured value stored via remember()"""
+        value = self.recall(key)
+        return redis_loads(value) if value is not None else None
+
+    def remember_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Store several items in agent memory with one Redis round-trip"""
+        return self.redis_service.mset_agent_memory(self.agent_id, items, ttl)
+
+    def recall_many(self, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Retrieve several items from agent memory with one Redis round-trip"""
+        return self.redis_service.mget_agent_memory(self.agent_id, keys)
+
+
+# Shared Anthropic clients, one per event loop - httpx connection pools can't cross loops
+_anthropic_clients: Dict[asyncio.AbstractEventLoop, AsyncAnthropic] = {}
+_anthropic_clients_lock = threading.Lock()
+
+
+def _create_anthropic_client() -> AsyncAnthropic:
+    """AsyncAnthropic with a tuned connection pool"""
+    return AsyncAnthropic(
+        api_key=settings.anthropic_api_key,
+        max_retries=2,
+        timeout=httpx.Timeout(settings.anthropic_timeout, connect=5.0),
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.anthropic_max_connections,
+                max_keepalive_connections=settings.anthropic_max_connections // 2,
+            ),
+        ),
+    )
+
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """
+    Process-wide AsyncAnthropic client for the running event loop
+
+    Agents built on the same loop share one connection pool, so TCP/TLS setup
+    is paid once rather than per agent. Outside a running loop a fresh client
+    is returned.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _create_anthropic_client()
+
+    with _anthropic_clients_lock:
+        client = _anthropic_clients.get(loop)
+        if client is None:
+            # Drop clients whose loop has finished - their pooled connections are dead
+            for stale in [l for l in _anthropic_clients if l.is_closed()]:
+                del _anthropic_clients[stale]
+            client = _anthropic_clients[loop] = _create_anthropic_client()
+        return client
+
 
 class BaseAgent(ABC):
     """
@@ -111,12 +513,12 @@ class BaseAgent(ABC):
     def __init__(
         self,
         agent_id: Optional[str] = None,
-        anthropic_client: Optional[Anthropic] = None,
+        anthropic_client: Optional[AsyncAnthropic] = None,
         redis_service: Optional[RedisService] = None,
         parallel_service: Optional[Any] = None,  # Accepts ParallelService or FallbackResearchService
     ):
         self.agent_id = agent_id or f"agent_{uuid.uuid4().hex[:8]}"
-        self.anthropic_client = anthropic_client or Anthropic(api_key=settings.anthropic_api_key)
+        self.anthropic_client = anthropic_client or get_anthropic_client()
         self.redis_service = redis_service or RedisService()
         self.parallel_service = parallel_service
 
@@ -2,10 +2,105 @@
 Condition Analyzer
 Final scoring and filtering of conditions based on forum results
 """
-from typing import List, Dict, Any
+import heapq
+import re
+import statistics
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Set, Tuple
 from loguru import logger
 from config import settings, BODY_REGIONS
-from models.schemas import MedicalCondition, ConditionEvidence, AgentResearchResult
+from models.schemas import CONDITIONS_ADAPTER, MedicalCondition, MedicalConditionDict, AgentResearchResult
+
+
+# Keyword tables - dict/list order is priority order (earlier entries win)
+REGION_KEYWORDS = {
+    "head": ["headache", "migraine", "concussion"],
+    "brain": ["alzheimer", "dementia", "stroke", "seizure"],
+    "heart": ["heart", "cardiac", "cardiovascular", "arrhythmia"],
+    "lungs": ["lung", "pneumonia", "asthma", "bronchitis"],
+    "respiratory": ["respiratory", "breathing"],
+    "stomach": ["stomach", "gastric", "ulcer"],
+    "liver": ["liver", "hepatitis", "cirrhosis"],
+    "kidneys": ["kidney", "renal"],
+    "digestive": ["digestive", "intestinal", "bowel", "ibs"],
+    "blood": ["anemia", "leukemia", "blood"],
+    "immune": ["immune", "autoimmune", "lupus"],
+    "endocrine": ["diabetes", "thyroid", "hormone"],
+    "musculoskeletal": ["arthritis", "bone", "joint", "muscle"],
+    "skin": ["skin", "dermatitis", "rash"],
+}
+
+TEST_MAPPINGS = {
+    "anemia": ["Complete Blood Count (CBC)", "Iron levels", "Ferritin test"],
+    "diabetes": ["Fasting blood glucose", "HbA1c test", "Oral glucose tolerance test"],
+    "thyroid": ["TSH test", "Free T4", "Thyroid antibodies"],
+    "heart": ["ECG", "Echocardiogram", "Stress test", "Cardiac enzymes"],
+    "liver": ["Liver function tests", "Ultrasound", "Bilirubin test"],
+    "kidney": ["Creatinine test", "BUN", "Urinalysis", "GFR"],
+}
+
+DEFAULT_TESTS = ["Physical examination", "Medical history review", "Targeted lab work"]
+
+EMERGENCY_KEYWORDS = ["stroke", "heart attack", "aneurysm", "sepsis", "meningitis"]
+URGENT_KEYWORDS = ["infection", "pneumonia", "acute", "severe"]
+GENERAL_SYMPTOMS = ["tired", "fatigue", "pain", "headache", "dizzy"]
+GENERAL_SYMPTOM_PENALTY = 0.8  # Probability multiplier when symptoms are too general
+
+
+def _compile_keyword_matcher(
+    entries: List[Tuple[str, Any, str]],
+) -> Tuple["re.Pattern", Dict[str, List[Tuple[str, Any]]]]:
+    """
+    Compile (category, payload, keyword) entries into a single regex pass
+
+    A lookahead alternation reports the longest keyword starting at each position.
+    Shorter keywords that are prefixes of it are attached to its hits, so every
+    substring occurrence is found in one scan (Aho-Corasick semantics).
+    """
+    keywords = sorted({kw for _, _, kw in entries}, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+    hits = {
+        kw: [(category, payload) for category, payload, other in entries if kw.startswith(other)]
+        for kw in keywords
+    }
+    return pattern, hits
+
+
+_KEYWORD_RE, _KEYWORD_HITS = _compile_keyword_matcher(
+    [("region", region, kw) for region, kws in REGION_KEYWORDS.items() for kw in kws]
+    + [("tests", key, key) for key in TEST_MAPPINGS]
+    + [("emergency", kw, kw) for kw in EMERGENCY_KEYWORDS]
+    + [("urgent", kw, kw) for kw in URGENT_KEYWORDS]
+)
+
+# Symptom text is free-form and long, so the generality check gets its own small matcher
+_GENERAL_RE, _GENERAL_HITS = _compile_keyword_matcher(
+    [("general", kw, kw) for kw in GENERAL_SYMPTOMS]
+)
+
+# Region priority and UI position, resolved once instead of per condition
+_REGION_RANK = {region: rank for rank, region in enumerate(REGION_KEYWORDS)}
+_DEFAULT_POSITION = BODY_REGIONS["general"]
+_REGION_POSITIONS = {
+    region: BODY_REGIONS.get(region, _DEFAULT_POSITION)
+    for region in (*REGION_KEYWORDS, "general")
+}
+
+_MATCHES_RE = re.compile(r"MATCHES:([^\n]*)")
+_PROBABILITY_RE = re.compile(r"probability[:\s]+([0-9.]+)")
+
+
+def _match_keywords(
+    text_lower: str,
+    pattern: "re.Pattern" = _KEYWORD_RE,
+    hits: Dict[str, List[Tuple[str, Any]]] = _KEYWORD_HITS,
+) -> Dict[str, Set[Any]]:
+    """Scan lowercased text once, returning matched payloads per category"""
+    matches = defaultdict(set)
+    for m in pattern.finditer(text_lower):
+        for category, payload in hits[m.group(1)]:
+            matches[category].add(payload)
+    return matches
 
 
 class ConditionAnalyzer:
@@ -33,9 +128,15 @@ class ConditionAnalyzer:
 
         Returns:
             List of MedicalCondition objects, filtered and scored
+
+        Conditions are scored as plain dicts; only the ones returned get validated.
         """
         logger.info(f"Analyzing {len(research_results)} conditions")
 
+        if not research_results:
+            logger.info("Analysis complete: 0 conditions passed filters")
+            return []
+
         conditions = []
 
         for result in research_results:
@@ -52,74 +153,75 @@ class ConditionAnalyzer:
             if self._should_include_condition(condition):
                 conditions.append(condition)
 
-        # Sort by probability (descending)
-        conditions.sort(key=lambda c: c.probability, reverse=True)
+        # Top MAX_CONDITIONS by probability (descending) - O(N log K) instead of a full sort
+        if len(conditions) > 1:
+            conditions = heapq.nlargest(settings.max_conditions, conditions, key=lambda c: c["probability"])
 
-        # Limit to MAX_CONDITIONS
-        conditions = conditions[:settings.max_conditions]
-
-        # Check if symptoms are too general
-        if self._are_symptoms_too_general(symptoms, conditions):
+        # Check if symptoms are too general (nothing to lower without conditions)
+        if conditions and self._are_symptoms_too_general(symptoms, conditions):
             logger.warning("Symptoms may be too general - adding warning")
-            # Lower all probabilities slightly
+            # Lower all probabilities slightly (list is already trimmed to MAX_CONDITIONS)
+            penalty = GENERAL_SYMPTOM_PENALTY
             for condition in conditions:
-                condition.probability *= 0.8
+                condition["probability"] *= penalty
 
         logger.info(f"Analysis complete: {len(conditions)} conditions passed filters")
-        return conditions
+        return CONDITIONS_ADAPTER.validate_python(conditions)
 
     def _create_condition_from_research(
         self,
         research: AgentResearchResult,
         final_confidence: float,
         symptoms: str,
-    ) -> MedicalCondition:
-        """Create MedicalCondition from research result"""
+    ) -> MedicalConditionDict:
+        """Create an (unvalidated) condition from research result"""
 
         # Extract probability from findings (or use confidence as fallback)
         probability = self._extract_probability(research.findings) or final_confidence or 0.70  # Default to 70% if no data
 
+        # One keyword scan of the name feeds region, urgency and test suggestions
+        matched_keywords = _match_keywords(research.condition_researched.lower())
+
         # Determine body region
-        body_region = self._infer_body_region(research.condition_researched)
+        body_region = self._infer_body_region(research.condition_researched, matched_keywords)
 
         # Get UI position
-        position = BODY_REGIONS.get(body_region, BODY_REGIONS["general"])
+        position = _REGION_POSITIONS[body_region]
 
         # Create evidence details
-        evidence_details = [
-            ConditionEvidence(
-                source=research.agent_type,
-                content=research.findings[:500],
-                relevance_score=final_confidence,
-            )
-        ]
+        evidence_details = [{
+            "source": research.agent_type,
+            "content": research.findings[:500],
+            "relevance_score": final_confidence,
+        }]
 
         # Determine urgency
         urgency = self._assess_urgency(
             research.condition_researched,
             probability,
             final_confidence,
+            matched_keywords,
         )
 
-        return MedicalCondition(
-            name=research.condition_researched,
-            probability=probability,
-            confidence=final_confidence,
-            body_region=body_region,
-            evidence_summary=research.findings[:300],
-            evidence_details=evidence_details,
-            position=position,
-            symptoms_matched=self._extract_matched_symptoms(research.reasoning),
-            recommended_tests=self._suggest_tests(research.condition_researched),
-            urgency=urgency,
-        )
+        return {
+            "name": research.condition_researched,
+            "probability": probability,
+            "confidence": final_confidence,
+            "body_region": body_region,
+            "evidence_summary": research.findings[:300],
+            "evidence_details": evidence_details,
+            "position": position,
+            "symptoms_matched": self._extract_matched_symptoms(research.reasoning),
+            "recommended_tests": self._suggest_tests(research.condition_researched, matched_keywords),
+            "urgency": urgency,
+        }
 
-    def _should_include_condition(self, condition: MedicalCondition) -> bool:
+    def _should_include_condition(self, condition: MedicalConditionDict) -> bool:
         """
         DEMO MODE: Simplified filtering to ensure conditions show up
         Just filter out obviously invalid conditions
         """
-        if condition.probability == 0 and condition.confidence == 0:
+        if condition["probability"] == 0 and condition["confidence"] == 0:
             return False
         # Allow all conditions with any probability/confidence > 0
         return True
@@ -127,95 +229,74 @@ class ConditionAnalyzer:
     def _extract_probability(self, findings_text: str) -> float:
         """Extract probability score from findings text"""
         # Look for probability indicators in text
-        findings_lower = findings_text.lower()
-
-        if "probability" in findings_lower:
-            # Try to extract numeric value
-            import re
-            match = re.search(r'probability[:\s]+([0-9.]+)', findings_lower)
-            if match:
-                try:
-                    return float(match.group(1))
-                except:
-                    pass
+        match = _PROBABILITY_RE.search(findings_text.lower())
+        if match:
+            try:
+                return float(match.group(1))
+            except:
+                pass
 
         # Fallback: return None to use confidence
         return None
 
-    def _infer_body_region(self, condition_name: str) -> str:
-        """Infer body region from condition name"""
-        condition_lower = condition_name.lower()
-
-        # Simple keyword matching
-        region_keywords = {
-            "head": ["headache", "migraine", "concussion"],
-            "brain": ["alzheimer", "dementia", "stroke", "seizure"],
-            "heart": ["heart", "cardiac", "cardiovascular", "arrhythmia"],
-            "lungs": ["lung", "pneumonia", "asthma", "bronchitis"],
-            "respiratory": ["respiratory", "breathing"],
-            "stomach": ["stomach", "gastric", "ulcer"],
-            "liver": ["liver", "hepatitis", "cirrhosis"],
-            "kidneys": ["kidney", "renal"],
-            "digestive": ["digestive", "intestinal", "bowel", "ibs"],
-            "blood": ["anemia", "leukemia", "blood"],
-            "immune": ["immune", "autoimmune", "lupus"],
-            "endocrine": ["diabetes", "thyroid", "hormone"],
-            "musculoskeletal": ["arthritis", "bone", "joint", "muscle"],
-            "skin": ["skin", "dermatitis", "rash"],
-        }
+    def _infer_body_region(
+        self,
+        condition_name: str,
+        matched_keywords: Optional[Dict[str, Set[Any]]] = None,
+    ) -> str:
+        """Infer body region from condition name (or its precomputed keyword matches)"""
+        if matched_keywords is None:
+            matched_keywords = _match_keywords(condition_name.lower())
+        matched = matched_keywords["region"]
 
-        for region, keywords in region_keywords.items():
-            if any(keyword in condition_lower for keyword in keywords):
-                return region
+        # Simple keyword matching - first region in table order wins
+        if matched:
+            return min(matched, key=_REGION_RANK.__getitem__)
 
         return "general"
 
     def _extract_matched_symptoms(self, reasoning_text: str) -> List[str]:
         """Extract matched symptoms from reasoning"""
         # Look for "MATCHES:" section
-        if "MATCHES:" in reasoning_text:
-            matches_section = reasoning_text.split("MATCHES:")[1].split("\n")[0]
-            symptoms = [s.strip() for s in matches_section.split(",")]
+        match = _MATCHES_RE.search(reasoning_text)
+        if match:
+            symptoms = [s.strip() for s in match.group(1).split(",")]
             return symptoms[:5]  # Top 5 matched symptoms
 
         return []
 
-    def _suggest_tests(self, condition_name: str) -> List[str]:
+    def _suggest_tests(
+        self,
+        condition_name: str,
+        matched_keywords: Optional[Dict[str, Set[Any]]] = None,
+    ) -> List[str]:
         """Suggest diagnostic tests for condition (simplified)"""
-        condition_lower = condition_name.lower()
-
-        test_mappings = {
-            "anemia": ["Complete Blood Count (CBC)", "Iron levels", "Ferritin test"],
-            "diabetes": ["Fasting blood glucose", "HbA1c test", "Oral glucose tolerance test"],
-            "thyroid": ["TSH test", "Free T4", "Thyroid antibodies"],
-            "heart": ["ECG", "Echocardiogram", "Stress test", "Cardiac enzymes"],
-            "liver": ["Liver function tests", "Ultrasound", "Bilirubin test"],
-            "kidney": ["Creatinine test", "BUN", "Urinalysis", "GFR"],
-        }
+        if matched_keywords is None:
+            matched_keywords = _match_keywords(condition_name.lower())
+        matched = matched_keywords["tests"]
 
-        for key, tests in test_mappings.items():
-            if key in condition_lower:
+        for key, tests in TEST_MAPPINGS.items():
+            if key in matched:
                 return tests
 
-        return ["Physical examination", "Medical history review", "Targeted lab work"]
+        return DEFAULT_TESTS
 
     def _assess_urgency(
         self,
         condition_name: str,
         probability: float,
         confidence: float,
+        matched_keywords: Optional[Dict[str, Set[Any]]] = None,
     ) -> str:
         """Assess urgency level for condition"""
-        condition_lower = condition_name.lower()
+        matched = matched_keywords if matched_keywords is not None else _match_keywords(condition_name.lower())
 
         # Emergency conditions
-        emergency_keywords = ["stroke", "heart attack", "aneurysm", "sepsis", "meningitis"]
-        if any(keyword in condition_lower for keyword in emergency_keywords):
+        if matched["emergency"]:
             return "emergency"
 
         # Urgent conditions
-        urgent_keywords = ["infection", "pneumonia", "acute", "severe"]
-        if any(keyword in condition_lower for keyword in urgent_keywords):
+        if matched["urgent"]:
             if probability > 0.6 or confidence > 0.7:
                 return "urgent"
 
@@ -232,19 +313,20 @@ class ConditionAnalyzer:
     def _are_symptoms_too_general(
         self,
         symptoms: str,
-        conditions: List[MedicalCondition],
+        conditions: List[MedicalConditionDict],
     ) -> bool:
         """Check if symptoms are too general to be reliable"""
-        symptoms_lower = symptoms.lower()
-
-        # Very general symptoms
-        general_symptoms = ["tired", "fatigue", "pain", "headache", "dizzy"]
-        symptom_count = sum(1 for s in general_symptoms if s in symptoms_lower)
+        # Only low-confidence results get flagged - check that first, since the symptom
+        # text (which includes extracted documents) is far larger than the condition list
+        avg_confidence = statistics.fmean(c["confidence"] for c in conditions) if conditions else 0
+        if avg_confidence >= 0.6:
+            return False
 
-        # If mostly general symptoms and low confidence, flag as too general
-        if symptom_count >= 2:
-            avg_confidence = sum(c.confidence for c in conditions) / len(conditions) if conditions else 0
-            if avg_confidence < 0.6:
+        # Mostly general symptoms - stop scanning once two distinct ones are seen
+        general_found = set()
+        for m in _GENERAL_RE.finditer(symptoms.lower()):
+            general_found.update(payload for _, payload in _GENERAL_HITS[m.group(1)])
+            if len(general_found) >= 2:
                 return True
 
         return False
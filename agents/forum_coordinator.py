@@ -3,13 +3,86 @@ Adversarial Forum Coordinator
 Manages multi-agent debate to cross-validate condition findings
 """
 import asyncio
-from typing import Dict, Any, List
+import json
+import re
+from typing import Dict, Any, List, Optional, Tuple
 from loguru import logger
 from models.schemas import ForumDebateResult, AgentResearchResult
 from .base_agent import BaseAgent, ReasoningCapability
 from config import settings
 
 
+MODERATOR_SYSTEM_PROMPT = """You are a senior medical diagnostician moderating a case review.
+Your role is to challenge assumptions and ensure thorough differential diagnosis.
+Be skeptical but fair. Focus on evidence quality."""
+
+_CONSENSUS_RE = re.compile(r"^[ \t]*CONSENSUS:(.*)$", re.MULTILINE)
+_CONTESTED_RE = re.compile(r"^[ \t]*CONTESTED:(.*)$", re.MULTILINE)
+_ADJUSTMENTS_RE = re.compile(r"^[ \t]*ADJUSTMENTS:", re.MULTILINE)
+_ADJUSTMENT_RE = re.compile(r"^[ \t]*([^:\n]+?)[ \t]*:[ \t]*([0-9]*\.?[0-9]+)[ \t]*$", re.MULTILINE)
+
+_CHALLENGE_LINE_RE = re.compile(r"^.*(?:contradicting evidence|argues against).*$", re.MULTILINE | re.IGNORECASE)
+_LONG_WORD_RE = re.compile(r"\S{6,}")
+
+
+def _split_conditions(text: str) -> List[str]:
+    """Split a comma-separated condition list"""
+    return [c.strip() for c in text.split(",") if c.strip()]
+
+
+class _ConsensusStreamParser:
+    """Incrementally parse CONSENSUS/CONTESTED/ADJUSTMENTS lines as text streams in"""
+
+    def __init__(self):
+        self.consensus_conditions: Optional[List[str]] = None
+        self.contested_conditions: Optional[List[str]] = None
+        self.adjustments: Dict[str, float] = {}
+        self._in_adjustments = False
+        self._pending: List[str] = []  # Fragments of the current unterminated line
+
+    def feed(self, chunk: str) -> None:
+        """Consume a chunk, committing every fully-terminated line"""
+        if "\n" not in chunk:
+            self._pending.append(chunk)
+            return
+
+        # Only the new chunk is split; buffered fragments are joined once per line
+        head, *lines, tail = chunk.split("\n")
+        self._pending.append(head)
+        self._commit_line("".join(self._pending))
+        for line in lines:
+            self._commit_line(line)
+        self._pending = [tail] if tail else []
+
+    def close(self) -> None:
+        """Commit the trailing unterminated line"""
+        if self._pending:
+            self._commit_line("".join(self._pending))
+            self._pending = []
+
+    def _commit_line(self, line: str) -> None:
+        if self.consensus_conditions is None:
+            match = _CONSENSUS_RE.match(line)
+            if match:
+                self.consensus_conditions = _split_conditions(match.group(1))
+                return
+        if self.contested_conditions is None:
+            match = _CONTESTED_RE.match(line)
+            if match:
+                self.contested_conditions = _split_conditions(match.group(1))
+                return
+        if not self._in_adjustments:
+            self._in_adjustments = _ADJUSTMENTS_RE.match(line) is not None
+            return
+        match = _ADJUSTMENT_RE.match(line)
+        if match:
+            self.adjustments[match.group(1).strip("- ").strip()] = float(match.group(2))
+
+
+# Semantic cache partition for completed debates
+FORUM_SEMANTIC_CACHE = "forum:debate"
+
+
 class AdversarialForum(BaseAgent, ReasoningCapability):
     """
     Adversarial forum where agents debate condition probabilities
@@ -18,7 +91,7 @@ class AdversarialForum(BaseAgent, ReasoningCapability):
 
     def _init_capabilities(self):
         """Initialize reasoning capability"""
-        ReasoningCapability.__init__(self, self.anthropic_client)
+        ReasoningCapability.__init__(self, self.anthropic_client, redis_service=self.redis_service)
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -42,92 +115,367 @@ class AdversarialForum(BaseAgent, ReasoningCapability):
 
         logger.info(f"[{self.agent_id}] Starting adversarial forum with {len(research_results)} agents")
 
-        # DEMO MODE: Skip debate rounds for speed, use simple consensus
-        # Just extract conditions from research results with default confidence
-        consensus_conditions = []
-        confidence_adjustments = {}
+        debate_history = []
 
-        for result in research_results:
-            if hasattr(result, 'condition_name'):
-                condition_name = result.condition_name
-                consensus_conditions.append(condition_name)
-                # Default confidence: 0.75 (75%)
-                confidence_adjustments[condition_name] = 0.75
-
-        consensus = {
-            "summary": f"Identified {len(consensus_conditions)} potential conditions based on symptoms",
-            "consensus_conditions": consensus_conditions,
-            "contested_points": [],
-            "confidence_adjustments": confidence_adjustments
+        if settings.forum_debate_rounds > 0:
+            cached = await self._get_cached_debate(symptoms, research_results)
+            if cached is not None:
+                return cached
+
+            debate_history = await self._conduct_debate(
+                research_results,
+                symptoms,
+                settings.forum_debate_rounds,
+            )
+
+            consensus = await self._synthesize_consensus(research_results, debate_history)
+        else:
+            # DEMO MODE: Skip debate rounds for speed, use simple consensus
+            # Just extract conditions from research results with default confidence
+            consensus_conditions = []
+            confidence_adjustments = {}
+
+            for result in research_results:
+                if hasattr(result, 'condition_name'):
+                    condition_name = result.condition_name
+                    consensus_conditions.append(condition_name)
+                    # Default confidence: 0.75 (75%)
+                    confidence_adjustments[condition_name] = 0.75
+
+            consensus = {
+                "summary": f"Identified {len(consensus_conditions)} potential conditions based on symptoms",
+                "consensus_conditions": consensus_conditions,
+                "contested_points": [],
+                "confidence_adjustments": confidence_adjustments
+            }
+
+        logger.info(f"[{self.agent_id}] Forum complete: {len(consensus.get('consensus_conditions', []))} consensus conditions")
+
+        forum_result = self._build_forum_result(research_results, debate_history, consensus)
+
+        if debate_history:
+            await self._cache_debate(symptoms, research_results, debate_history, consensus, forum_result)
+
+        return forum_result
+
+    async def _get_cached_debate(
+        self,
+        symptoms: str,
+        research_results: List[AgentResearchResult],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Debate cached for semantically equivalent symptoms over the same conditions
+
+        Only the symptoms are matched by similarity - the condition set must be equal,
+        so a debate is never replayed for different conditions.
+        """
+        if not settings.forum_semantic_cache:
+            return None
+
+        # Embedding and the Redis round-trip block - keep them off the event loop
+        cached = await asyncio.to_thread(
+            self.redis_service.semantic_lookup,
+            FORUM_SEMANTIC_CACHE,
+            self._debate_cache_text(symptoms, research_results),
+            settings.forum_cache_similarity_threshold,
+        )
+        if not cached:
+            return None
+
+        entry = json.loads(cached)
+        conditions = self._debate_conditions(research_results)
+        if entry.get("conditions") != conditions:
+            logger.debug(f"[{self.agent_id}] Cached debate covers other conditions - not reused")
+            return None
+
+        # Re-key adjustments to this session's condition names and agents
+        debate_result = ForumDebateResult.model_validate(entry["debate_result"])
+        cached_adjustments = {
+            name.lower().strip(): value
+            for name, value in debate_result.final_confidence_adjustments.items()
+        }
+        adjustments = {
+            r.condition_researched: cached_adjustments[r.condition_researched.lower().strip()]
+            for r in research_results
+            if r.condition_researched and r.condition_researched.lower().strip() in cached_adjustments
         }
+        debate_result = debate_result.model_copy(update={
+            "final_confidence_adjustments": adjustments,
+            "participant_agents": [r.agent_id for r in research_results],
+        })
+
+        logger.info(f"[{self.agent_id}] Reusing cached forum debate")
+        return {
+            "debate_result": debate_result,
+            "adjusted_confidences": adjustments,
+        }
+
+    async def _cache_debate(
+        self,
+        symptoms: str,
+        research_results: List[AgentResearchResult],
+        debate_history: List[Dict[str, Any]],
+        consensus: Dict[str, Any],
+        forum_result: Dict[str, Any],
+    ) -> None:
+        """Store a completed debate, unless caching is off or any LLM call in it failed"""
+        if not settings.forum_semantic_cache:
+            return
+
+        failed_critique = any(
+            critique.startswith("Error:")
+            for debate_round in debate_history
+            for critique in debate_round.get("critiques", {}).values()
+        )
+        if failed_critique or consensus.get("failed"):
+            logger.debug(f"[{self.agent_id}] Debate had failed LLM calls - not cached")
+            return
+
+        await asyncio.to_thread(
+            self.redis_service.semantic_store,
+            FORUM_SEMANTIC_CACHE,
+            self._debate_cache_text(symptoms, research_results),
+            json.dumps({
+                "conditions": self._debate_conditions(research_results),
+                "debate_result": forum_result["debate_result"].model_dump(mode="json"),
+            }),
+        )
+
+    async def execute_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Conduct debates for several non-interactive tasks at once
+
+        With USE_BATCH_API enabled, every round's critiques (and the final consensus
+        calls) for all tasks are submitted as a single Message Batch - half the cost
+        of live calls, at the price of latency. Otherwise each task runs via execute().
+
+        Args:
+            tasks: List of execute() task dicts
+
+        Returns:
+            List of execute() result dicts, in task order
+        """
+        if not settings.use_batch_api or settings.forum_debate_rounds <= 0:
+            return list(await asyncio.gather(*[self.execute(task) for task in tasks]))
+
+        logger.info(f"[{self.agent_id}] Starting batched forum for {len(tasks)} tasks")
+
+        researched_by_task = [
+            [r for r in task.get("research_results", []) if r.condition_researched]
+            for task in tasks
+        ]
+        histories: List[List[Dict[str, Any]]] = [[] for _ in tasks]
+
+        for round_num in range(1, settings.forum_debate_rounds + 1):
+            # custom_id must match ^[a-zA-Z0-9_-]{1,64}$, so use indexes rather than names
+            requests = {}
+            for t_idx, (task, researched) in enumerate(zip(tasks, researched_by_task)):
+                context = self._format_research_for_debate(researched)
+                for c_idx, result in enumerate(researched):
+                    prompt_prefix, prompt = self._build_critique_prompt(
+                        result.condition_researched,
+                        context,
+                        task.get("symptoms", ""),
+                        histories[t_idx],
+                    )
+                    requests[f"t{t_idx}-c{c_idx}-r{round_num}"] = (
+                        prompt, MODERATOR_SYSTEM_PROMPT, 0.6, prompt_prefix,
+                    )
+
+            responses = await self.reason_batch(requests)
+
+            for t_idx, researched in enumerate(researched_by_task):
+                critiques = {
+                    result.condition_researched: responses.get(f"t{t_idx}-c{c_idx}-r{round_num}", "")
+                    for c_idx, result in enumerate(researched)
+                }
+                histories[t_idx].append(self._build_round_result(critiques))
+
+        responses = await self.reason_batch({
+            f"t{t_idx}-consensus": (self._build_consensus_prompt(history), None, 0.4, None)
+            for t_idx, history in enumerate(histories)
+        })
+
+        results = []
+        for t_idx, (task, history) in enumerate(zip(tasks, histories)):
+            research_results = task.get("research_results", [])
+            consensus = self._parse_consensus(
+                responses.get(f"t{t_idx}-consensus", ""),
+                research_results,
+                history,
+            )
+            results.append(self._build_forum_result(research_results, history, consensus))
 
+        logger.info(f"[{self.agent_id}] Batched forum complete for {len(tasks)} tasks")
+        return results
+
+    def _debate_cache_text(
+        self,
+        symptoms: str,
+        research_results: List[AgentResearchResult],
+    ) -> str:
+        """Canonical text embedded for the debate cache (condition order doesn't matter)"""
+        return f"{symptoms}|{','.join(self._debate_conditions(research_results))}"
+
+    @staticmethod
+    def _debate_conditions(research_results: List[AgentResearchResult]) -> List[str]:
+        """Canonical condition list of a debate - a cached debate is reused only for the same one"""
+        return sorted(
+            r.condition_researched.lower().strip()
+            for r in research_results
+            if r.condition_researched
+        )
+
+    def _build_forum_result(
+        self,
+        research_results: List[AgentResearchResult],
+        debate_history: List[Dict[str, Any]],
+        consensus: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Package consensus into the execute() return format"""
         debate_result = ForumDebateResult(
             debate_summary=consensus.get("summary", ""),
             consensus_conditions=consensus.get("consensus_conditions", []),
             contested_points=consensus.get("contested_points", []),
             final_confidence_adjustments=consensus.get("confidence_adjustments", {}),
             participant_agents=[r.agent_id for r in research_results],
-            debate_rounds=1,  # DEMO: 1 round (instant)
+            debate_rounds=max(len(debate_history), 1),  # DEMO mode reports 1 round (instant)
         )
 
-        logger.info(f"[{self.agent_id}] Forum complete: {len(consensus.get('consensus_conditions', []))} consensus conditions")
-
         return {
             "debate_result": debate_result,
             "adjusted_confidences": consensus.get("confidence_adjustments", {}),
         }
 
-    async def _conduct_debate_round(
+    async def _conduct_debate(
         self,
         research_results: List[AgentResearchResult],
         symptoms: str,
+        rounds: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Conduct all debate rounds as a per-condition pipeline
+        A condition's next critique only depends on its own previous critiques, so it
+        starts as soon as that one lands instead of waiting for the slowest condition
+        """
+        researched = [r for r in research_results if r.condition_researched]
+
+        # Prepare debate context (shared by every critique)
+        context = self._format_research_for_debate(researched)
+
+        critiques: Dict[str, List[str]] = {r.condition_researched: [] for r in researched}
+        task_conditions: Dict[asyncio.Task, str] = {}
+
+        def schedule(condition: str) -> asyncio.Task:
+            previous_rounds = [{"critiques": {condition: c}} for c in critiques[condition]]
+            prompt_prefix, prompt = self._build_critique_prompt(condition, context, symptoms, previous_rounds)
+            task = asyncio.create_task(self.reason(
+                prompt,
+                MODERATOR_SYSTEM_PROMPT,
+                temperature=0.6,
+                prompt_prefix=prompt_prefix,
+            ))
+            task_conditions[task] = condition
+            return task
+
+        pending = {schedule(condition) for condition in critiques}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                condition = task_conditions.pop(task)
+                critiques[condition].append(task.result())
+                if len(critiques[condition]) < rounds:
+                    pending.add(schedule(condition))
+
+        return [
+            self._build_round_result({
+                condition: history[i] for condition, history in critiques.items()
+            })
+            for i in range(rounds)
+        ]
+
+    def _build_round_result(self, critiques: Dict[str, str]) -> Dict[str, Any]:
+        """Combine per-condition critiques into one debate round"""
+        round_analysis = "\n\n".join(
+            f"{condition}:\n{critique}" for condition, critique in critiques.items()
+        )
+
+        # Parse debate outcomes
+        return {
+            "round_analysis": round_analysis,
+            "critiques": critiques,
+            "challenged_conditions": self._extract_challenged_conditions(round_analysis),
+        }
+
+    def _build_critique_prompt(
+        self,
+        condition: str,
+        context: str,
+        symptoms: str,
         previous_rounds: List[Dict[str, Any]],
-    ) -> Dict[str, Any]:
-        """Conduct one round of adversarial debate"""
+    ) -> Tuple[str, str]:
+        """
+        Build the prompt critiquing a single condition against the other agents' findings
 
-        # Prepare debate context
-        context = self._format_research_for_debate(research_results)
-        previous_context = self._format_previous_rounds(previous_rounds)
+        Returns:
+            (prompt_prefix, prompt) - the prefix (symptoms, findings, instructions) is
+            identical for every condition and round of a debate, so it is prompt-cached
+        """
+        previous_context = self._format_previous_rounds(previous_rounds, condition)
 
-        prompt = f"""You are moderating a medical diagnostic forum. Agents have researched conditions and must now debate their findings.
+        prompt_prefix = f"""You are moderating a medical diagnostic forum. Agents have researched conditions and must now debate their findings.
 
 Patient Symptoms: {symptoms}
 
 Agent Research Findings:
 {context}
 
-{previous_context}
-
-For each condition, provide:
+For the condition under review, provide:
 1. SUPPORTING EVIDENCE: What supports this diagnosis?
 2. CONTRADICTING EVIDENCE: What argues against it?
 3. CONFIDENCE ADJUSTMENT: Should confidence increase, decrease, or stay same? (up/down/same)
 
 Be critical and objective. Look for contradictions and weak reasoning."""
 
-        system_prompt = """You are a senior medical diagnostician moderating a case review.
-Your role is to challenge assumptions and ensure thorough differential diagnosis.
-Be skeptical but fair. Focus on evidence quality."""
+        prompt = f"""{previous_context}
 
-        response = await self.reason(prompt, system_prompt, temperature=0.6)
+Condition under review: {condition}"""
 
-        # Parse debate outcomes
-        return {
-            "round_analysis": response,
-            "challenged_conditions": self._extract_challenged_conditions(response),
-        }
+        return prompt_prefix, prompt
 
     async def _synthesize_consensus(
         self,
         research_results: List[AgentResearchResult],
         debate_history: List[Dict[str, Any]],
     ) -> Dict[str, Any]:
-        """Synthesize final consensus from debate"""
+        """Synthesize final consensus from debate, parsing the response as it streams"""
+        prompt = self._build_consensus_prompt(debate_history)
+
+        parser = _ConsensusStreamParser()
+        failed = None
+        async for chunk in self.reason_stream(prompt, temperature=0.4):
+            if failed is None:
+                # reason_stream reports a failed call as a single "Error: ..." chunk
+                failed = chunk.startswith("Error:")
+            parser.feed(chunk)
+        parser.close()
+
+        consensus = self._map_consensus(
+            parser.consensus_conditions or [],
+            parser.contested_conditions or [],
+            parser.adjustments,
+            research_results,
+            debate_history,
+        )
+        consensus["failed"] = bool(failed)
+        return consensus
 
+    def _build_consensus_prompt(self, debate_history: List[Dict[str, Any]]) -> str:
+        """Build the consensus prompt from all debate rounds"""
         # Prepare debate summary
         debate_summary = "\n\n".join([r.get("round_analysis", "") for r in debate_history])
 
-        prompt = f"""Based on the adversarial debate, provide final consensus.
+        return f"""Based on the adversarial debate, provide final consensus.
 
 Debate Summary:
 {debate_summary}
@@ -145,46 +493,54 @@ ADJUSTMENTS:
 - [condition]: [multiplier]
 ..."""
 
-        response = await self.reason(prompt, temperature=0.4)
-
-        # Parse consensus
-        consensus_conditions = []
-        contested_conditions = []
-        confidence_adjustments = {}
-
-        lines = response.split("\n")
-        section = None
+    def _parse_consensus(
+        self,
+        response: str,
+        research_results: List[AgentResearchResult],
+        debate_history: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Parse a buffered consensus response and map adjustments to agent findings"""
+        # Parse consensus - each section is one regex sweep over the response
+        consensus_match = _CONSENSUS_RE.search(response)
+        consensus_conditions = _split_conditions(consensus_match.group(1)) if consensus_match else []
+
+        contested_match = _CONTESTED_RE.search(response)
+        contested_conditions = _split_conditions(contested_match.group(1)) if contested_match else []
+
+        adjustments_match = _ADJUSTMENTS_RE.search(response)
+        confidence_adjustments = {
+            m.group(1).strip("- ").strip(): float(m.group(2))
+            for m in _ADJUSTMENT_RE.finditer(response, adjustments_match.end())
+        } if adjustments_match else {}
+
+        return self._map_consensus(
+            consensus_conditions,
+            contested_conditions,
+            confidence_adjustments,
+            research_results,
+            debate_history,
+        )
 
-        for line in lines:
-            line = line.strip()
-            if line.startswith("CONSENSUS:"):
-                section = "consensus"
-                conditions = line.split(":", 1)[1].strip()
-                consensus_conditions = [c.strip() for c in conditions.split(",") if c.strip()]
-            elif line.startswith("CONTESTED:"):
-                section = "contested"
-                conditions = line.split(":", 1)[1].strip()
-                contested_conditions = [c.strip() for c in conditions.split(",") if c.strip()]
-            elif line.startswith("ADJUSTMENTS:"):
-                section = "adjustments"
-            elif section == "adjustments" and ":" in line:
-                parts = line.split(":", 1)
-                condition = parts[0].strip("- ").strip()
-                try:
-                    multiplier = float(parts[1].strip())
-                    confidence_adjustments[condition] = multiplier
-                except:
-                    pass
+    def _map_consensus(
+        self,
+        consensus_conditions: List[str],
+        contested_conditions: List[str],
+        confidence_adjustments: Dict[str, float],
+        research_results: List[AgentResearchResult],
+        debate_history: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Map parsed adjustments to agent findings"""
+        debate_summary = "\n\n".join([r.get("round_analysis", "") for r in debate_history])
 
         # Map adjustments to agent findings
         final_adjustments = {}
         for result in research_results:
             condition = result.condition_researched
-            if condition in confidence_adjustments:
+            multiplier = confidence_adjustments.get(condition)
+            if multiplier is not None:
                 # Adjust confidence
-                original_confidence = result.confidence
-                adjusted = original_confidence * confidence_adjustments[condition]
-                final_adjustments[condition] = min(max(adjusted, 0.0), 1.0)
+                adjusted = result.confidence * multiplier
+                final_adjustments[condition] = 0.0 if adjusted < 0.0 else 1.0 if adjusted > 1.0 else adjusted
             else:
                 final_adjustments[condition] = result.confidence
 
@@ -201,35 +557,39 @@ ADJUSTMENTS:
 
     def _format_research_for_debate(self, research_results: List[AgentResearchResult]) -> str:
         """Format research results for debate context"""
-        formatted = []
-        for result in research_results:
-            formatted.append(
-                f"Agent {result.agent_id}:\n"
-                f"  Condition: {result.condition_researched}\n"
-                f"  Confidence: {result.confidence:.2f}\n"
-                f"  Findings: {result.findings[:200]}...\n"
-                f"  Sources: {', '.join(result.sources[:3])}\n"
-            )
-        return "\n".join(formatted)
+        return "\n".join(
+            f"Agent {r.agent_id}:\n"
+            f"  Condition: {r.condition_researched}\n"
+            f"  Confidence: {r.confidence:.2f}\n"
+            f"  Findings: {r.findings[:200]}...\n"
+            f"  Sources: {', '.join(r.sources[:3])}\n"
+            for r in research_results
+        )
 
-    def _format_previous_rounds(self, previous_rounds: List[Dict[str, Any]]) -> str:
-        """Format previous debate rounds"""
+    def _format_previous_rounds(
+        self,
+        previous_rounds: List[Dict[str, Any]],
+        condition: Optional[str] = None,
+    ) -> str:
+        """Format previous debate rounds (optionally only one condition's critiques)"""
         if not previous_rounds:
             return ""
 
-        return f"\nPrevious Debate Rounds:\n" + "\n".join([
-            f"Round {i+1}: {r.get('round_analysis', '')[:200]}..."
-            for i, r in enumerate(previous_rounds)
-        ])
+        if condition:
+            texts = (r.get("critiques", {}).get(condition, "") for r in previous_rounds)
+        else:
+            texts = (r.get("round_analysis", "") for r in previous_rounds)
+
+        return "\nPrevious Debate Rounds:\n" + "\n".join(
+            f"Round {i}: {text[:200]}..." for i, text in enumerate(texts, 1)
+        )
 
     def _extract_challenged_conditions(self, debate_text: str) -> List[str]:
         """Extract conditions that were challenged in debate"""
-        challenged = []
-        for line in debate_text.split("\n"):
-            if "contradicting evidence" in line.lower() or "argues against" in line.lower():
-                # Extract condition name (simplified)
-                words = line.split()
-                for word in words:
-                    if len(word) > 5 and word[0].isupper():
-                        challenged.append(word)
-        return list(set(challenged))
+        # Capitalized words (simplified condition names) on lines raising objections
+        return list({
+            word
+            for line in _CHALLENGE_LINE_RE.finditer(debate_text)
+            for word in _LONG_WORD_RE.findall(line.group())
+            if word[0].isupper()
+        })
@@ -3,13 +3,86 @@ Research agents for medical symptom analysis
 - CoarseSearchAgent: High-level condition identification
 - DeepResearchAgent: Detailed condition investigation
 """
+import asyncio
+import re
 import time
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from loguru import logger
 from config import settings
 from models.schemas import AgentResearchResult
 from .base_agent import BaseAgent, ResearchCapability, ReasoningCapability
 
+_CONDITION_HINT_RE = re.compile(r"condition|disease", re.IGNORECASE)
+
+# "1. Name", "1) Name" or "- Name" list items
+_LIST_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|-)\s*(.+?)\s*$")
+
+# "PROBABILITY: 0.7" / "MATCHES: a, b" lines of a condition analysis
+_ANALYSIS_FIELD_RE = re.compile(r"^(PROBABILITY|MATCHES):(.*)$", re.MULTILINE)
+
+
+class _EarlyConditionDispatcher:
+    """
+    Queues coarse-search conditions as soon as they are certain to make the final list
+
+    Conditions found by both the LLM and research pass rank first in
+    _synthesize_conditions (in LLM order), so once the research pass is in, the
+    first MAX_CONDITIONS of them can be dispatched while the LLM is still streaming.
+    Everything else is dispatched when the coarse search completes, then None.
+
+    The queue therefore follows dispatch order, not final_conditions order, and a
+    dispatched condition can still miss the final list (e.g. if the LLM stream fails
+    after queueing it) - consumers filter by the returned conditions.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+        self.intuition: List[str] = []
+        self.research_keys: Optional[set] = None
+        self._dispatched = set()
+        self._closed = False
+
+    def add_intuition(self, condition: str) -> None:
+        self.intuition.append(condition)
+        self._dispatch_certain()
+
+    def set_research(self, conditions: List[str]) -> None:
+        self.research_keys = {c.lower().strip() for c in conditions}
+        self._dispatch_certain()
+
+    def close(self, final_conditions: List[str]) -> None:
+        """Dispatch the remaining final conditions and the end-of-stream marker"""
+        if self._closed:
+            return
+        self._closed = True
+        for condition in final_conditions:
+            self._dispatch(condition)
+        self.queue.put_nowait(None)
+
+    def _dispatch_certain(self) -> None:
+        if self._closed or self.research_keys is None:
+            return
+
+        seen = set()
+        certain = 0
+        for condition in self.intuition:
+            condition_key = condition.lower().strip()
+            if condition_key in seen:
+                continue
+            seen.add(condition_key)
+
+            if condition_key in self.research_keys:
+                self._dispatch(condition)
+                certain += 1
+                if certain >= settings.max_conditions:
+                    return
+
+    def _dispatch(self, condition: str) -> None:
+        condition_key = condition.lower().strip()
+        if condition_key not in self._dispatched:
+            self._dispatched.add(condition_key)
+            self.queue.put_nowait(condition)
+
 
 class CoarseSearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
     """
@@ -19,15 +92,21 @@ class CoarseSearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
 
     def _init_capabilities(self):
         """Initialize research and reasoning capabilities"""
-        ResearchCapability.__init__(self, self.parallel_service)
-        ReasoningCapability.__init__(self, self.anthropic_client)
+        ResearchCapability.__init__(self, self.parallel_service, redis_service=self.redis_service)
+        ReasoningCapability.__init__(self, self.anthropic_client, redis_service=self.redis_service)
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute coarse search to identify potential conditions
 
         Args:
-            task: {"symptoms": str, "patient_context": Optional[Dict]}
+            task: {
+                "symptoms": str,
+                "patient_context": Optional[Dict],
+                "condition_queue": Optional[asyncio.Queue] - receives each final condition as
+                    early as it is known, followed by None (dispatch order, not the order of
+                    "conditions"; early picks may be absent from "conditions")
+            }
 
         Returns:
             {"conditions": List[str], "reasoning": str, "research_result": AgentResearchResult}
@@ -35,23 +114,48 @@ class CoarseSearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
         start_time = time.time()
         symptoms = task.get("symptoms", "")
         patient_context = task.get("patient_context", {})
+        condition_queue = task.get("condition_queue")
+        dispatcher = _EarlyConditionDispatcher(condition_queue) if condition_queue else None
 
         logger.info(f"[{self.agent_id}] Starting coarse search for symptoms")
 
-        # Step 1: LLM intuition pass (no tools)
-        intuition_conditions = await self._llm_intuition_search(symptoms, patient_context)
-
-        # Step 2: Parallel.ai research pass
-        research_conditions = await self._parallel_research_search(symptoms)
-
-        # Step 3: Synthesize results
-        final_conditions = self._synthesize_conditions(
-            intuition_conditions,
-            research_conditions,
-        )
+        final_conditions = []
+        try:
+            async def research_pass() -> List[str]:
+                conditions = await self._parallel_research_search(symptoms)
+                if dispatcher:
+                    dispatcher.set_research(conditions)
+                return conditions
+
+            # Steps 1+2: LLM intuition pass (no tools) and Parallel.ai research pass are independent
+            intuition_conditions, research_conditions = await asyncio.gather(
+                self._llm_intuition_search(
+                    symptoms,
+                    patient_context,
+                    on_condition=dispatcher.add_intuition if dispatcher else None,
+                ),
+                research_pass(),
+                return_exceptions=True,
+            )
+            if isinstance(intuition_conditions, Exception):
+                logger.error(f"[{self.agent_id}] LLM intuition search failed: {intuition_conditions}")
+                intuition_conditions = []
+            if isinstance(research_conditions, Exception):
+                logger.error(f"[{self.agent_id}] Research search failed: {research_conditions}")
+                research_conditions = []
+
+            # Step 3: Synthesize results
+            final_conditions = self._synthesize_conditions(
+                intuition_conditions,
+                research_conditions,
+            )
 
-        # Limit to MAX_CONDITIONS
-        final_conditions = final_conditions[:settings.max_conditions]
+            # Limit to MAX_CONDITIONS
+            final_conditions = final_conditions[:settings.max_conditions]
+        finally:
+            # Always terminate the queue so consumers never wait forever
+            if dispatcher:
+                dispatcher.close(final_conditions)
 
         processing_time = int((time.time() - start_time) * 1000)
 
@@ -78,42 +182,61 @@ class CoarseSearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
         self,
         symptoms: str,
         patient_context: Dict[str, Any],
+        on_condition: Optional[Callable[[str], None]] = None,
     ) -> List[str]:
-        """LLM-only reasoning about potential conditions"""
+        """
+        LLM-only reasoning about potential conditions
+
+        The response is streamed and parsed line by line; on_condition is called with
+        each condition as soon as its line completes.
+        """
         context_str = ""
         if patient_context.get("age"):
             context_str += f"Age: {patient_context['age']}\n"
         if patient_context.get("sex"):
             context_str += f"Sex: {patient_context['sex']}\n"
 
-        prompt = f"""You are a medical diagnostician. Based on these symptoms, identify {settings.max_conditions * 2} possible medical conditions (cast a wide net).
-
-{context_str}
-Symptoms: {symptoms}
+        # Static instructions lead (prompt-cached); the patient-specific part follows
+        prompt_prefix = f"""You are a medical diagnostician. Based on the symptoms below, identify {settings.max_conditions * 2} possible medical conditions (cast a wide net).
 
 Return ONLY a numbered list of condition names, no explanations:
 1. [Condition name]
 2. [Condition name]
 ..."""
 
+        prompt = f"""{context_str}
+Symptoms: {symptoms}"""
+
         system_prompt = """You are an expert medical diagnostician with 20+ years of experience.
 You excel at differential diagnosis - considering all possibilities before narrowing down.
 Be thorough but precise in identifying potential conditions."""
 
-        response = await self.reason(prompt, system_prompt, temperature=0.7)
-
-        # Parse condition list
+        limit = settings.max_conditions * 2
         conditions = []
-        for line in response.split("\n"):
-            line = line.strip()
-            if line and (line[0].isdigit() or line.startswith("-")):
-                # Extract condition name
-                condition = line.split(".", 1)[-1].split("-", 1)[-1].strip()
-                if condition:
-                    conditions.append(condition)
+
+        def collect(line: str) -> None:
+            condition = self._parse_condition_line(line)
+            if condition and len(conditions) < limit:
+                conditions.append(condition)
+                if on_condition:
+                    on_condition(condition)
+
+        # Parse condition list as it streams in
+        pending = ""
+        async for chunk in self.reason_stream(prompt, system_prompt, temperature=0.7, prompt_prefix=prompt_prefix):
+            *lines, pending = (pending + chunk).split("\n")
+            for line in lines:
+                collect(line)
+        collect(pending)
 
         logger.debug(f"LLM intuition identified {len(conditions)} conditions")
-        return conditions[:settings.max_conditions * 2]
+        return conditions
+
+    @staticmethod
+    def _parse_condition_line(line: str) -> Optional[str]:
+        """Extract a condition name from a numbered/bulleted list line"""
+        match = _LIST_ITEM_RE.match(line)
+        return match.group(1) if match else None
 
     async def _parallel_research_search(self, symptoms: str) -> List[str]:
         """Parallel.ai research for conditions"""
@@ -125,19 +248,22 @@ Be thorough but precise in identifying potential conditions."""
             )
 
             # Extract condition names from research
+            limit = settings.max_conditions
             conditions = []
             for result in results:
                 content = result.get("content", "")
                 # Simple extraction - look for condition names in titles/headings
-                if "condition" in content.lower() or "disease" in content.lower():
-                    # Extract potential condition names (this is simplified)
-                    lines = content.split("\n")
-                    for line in lines[:5]:  # Check first few lines
-                        if line.strip() and len(line) < 100:
-                            conditions.append(line.strip())
+                # (regex search avoids lowercasing the whole document)
+                if _CONDITION_HINT_RE.search(content):
+                    # Extract potential condition names (this is simplified) - only split off the first few lines
+                    for line in content.split("\n", 5)[:5]:
+                        if len(line) < 100 and (name := line.strip()):
+                            conditions.append(name)
+                if len(conditions) >= limit:
+                    break
 
             logger.debug(f"Parallel.ai research found {len(conditions)} potential conditions")
-            return conditions[:settings.max_conditions]
+            return conditions[:limit]
 
         except Exception as e:
             logger.error(f"Parallel.ai search failed: {e}")
@@ -149,24 +275,26 @@ Be thorough but precise in identifying potential conditions."""
         research: List[str],
     ) -> List[str]:
         """Combine and deduplicate conditions from both sources"""
-        # Combine both lists
-        all_conditions = intuition + research
+        intuition_keys = {c.lower().strip() for c in intuition}
+        research_keys = {c.lower().strip() for c in research}
 
-        # Deduplicate (case-insensitive)
+        # Deduplicate (case-insensitive), prioritizing conditions that appear in both sources
         seen = set()
-        unique_conditions = []
-        for condition in all_conditions:
-            condition_lower = condition.lower().strip()
-            if condition_lower not in seen:
-                seen.add(condition_lower)
-                unique_conditions.append(condition)
-
-        # Prioritize conditions that appear in both sources
-        high_priority = [c for c in unique_conditions if c in intuition and c in research]
-        medium_priority = [c for c in unique_conditions if c in intuition or c in research]
+        high_priority = []
+        medium_priority = []
+        for condition in intuition + research:
+            condition_key = condition.lower().strip()
+            if condition_key in seen:
+                continue
+            seen.add(condition_key)
+
+            if condition_key in intuition_keys and condition_key in research_keys:
+                high_priority.append(condition)
+            else:
+                medium_priority.append(condition)
 
         # Combine with high priority first
-        final = high_priority + [c for c in medium_priority if c not in high_priority]
+        final = high_priority + medium_priority
 
         return final[:settings.max_conditions * 2]  # Return extras for filtering later
 
@@ -179,8 +307,8 @@ class DeepResearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
 
     def _init_capabilities(self):
         """Initialize research and reasoning capabilities"""
-        ResearchCapability.__init__(self, self.parallel_service)
-        ReasoningCapability.__init__(self, self.anthropic_client)
+        ResearchCapability.__init__(self, self.parallel_service, redis_service=self.redis_service)
+        ReasoningCapability.__init__(self, self.anthropic_client, redis_service=self.redis_service)
 
     async def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -190,7 +318,9 @@ class DeepResearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
             task: {
                 "condition": str,
                 "symptoms": str,
-                "patient_context": Optional[Dict]
+                "patient_context": Optional[Dict],
+                "agent_id": Optional[str],  # Per-condition id when one agent serves many
+                "prefetched_research": Optional[Awaitable[Dict]]  # Skips the research call
             }
 
         Returns:
@@ -205,14 +335,16 @@ class DeepResearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
         condition = task.get("condition", "")
         symptoms = task.get("symptoms", "")
         patient_context = task.get("patient_context", {})
+        agent_id = task.get("agent_id") or self.agent_id
 
-        logger.info(f"[{self.agent_id}] Deep research on: {condition}")
-
-        # Sub-search 1: LLM intuition about this specific condition
-        intuition = await self._llm_condition_analysis(condition, symptoms, patient_context)
+        logger.info(f"[{agent_id}] Deep research on: {condition}")
 
-        # Sub-search 2: Parallel.ai detailed research
-        research = await self.research_condition_details(condition, symptoms)
+        # Sub-searches run concurrently: LLM intuition about this specific condition
+        # and Parallel.ai detailed research
+        intuition, research = await asyncio.gather(
+            self._llm_condition_analysis(condition, symptoms, patient_context),
+            task.get("prefetched_research") or self.research_condition_details(condition, symptoms),
+        )
 
         # Synthesize evidence
         evidence = self._synthesize_evidence(intuition, research, symptoms)
@@ -220,7 +352,7 @@ class DeepResearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
         processing_time = int((time.time() - start_time) * 1000)
 
         research_result = AgentResearchResult(
-            agent_id=self.agent_id,
+            agent_id=agent_id,
             agent_type="deep_research",
             condition_researched=condition,
             findings=evidence.get("summary", ""),
@@ -230,7 +362,7 @@ class DeepResearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
             processing_time_ms=processing_time,
         )
 
-        logger.info(f"[{self.agent_id}] Deep research complete for {condition}")
+        logger.info(f"[{agent_id}] Deep research complete for {condition}")
 
         return {
             "condition": condition,
@@ -246,10 +378,8 @@ class DeepResearchAgent(BaseAgent, ResearchCapability, ReasoningCapability):
         patient_context: Dict[str, Any],
     ) -> Dict[str, Any]:
         """LLM analysis of condition match with symptoms"""
-        prompt = f"""Analyze how well this condition matches the patient's symptoms.
-
-Condition: {condition}
-Symptoms: {symptoms}
+        # Static instructions lead (prompt-cached); the condition and symptoms follow
+        prompt_prefix = """Analyze how well the condition below matches the patient's symptoms.
 
 Provide:
 1. Probability this condition matches symptoms (0.0-1.0)
@@ -263,24 +393,27 @@ MATCHES: [list]
 MISMATCHES: [list]
 REASONING: [explanation]"""
 
+        prompt = f"""Condition: {condition}
+Symptoms: {symptoms}"""
+
         system_prompt = """You are a medical expert evaluating diagnostic hypotheses.
 Be objective and evidence-based. Consider both positive and negative evidence."""
 
-        response = await self.reason(prompt, system_prompt, temperature=0.5)
+        response = await self.reason(prompt, system_prompt, temperature=0.5, prompt_prefix=prompt_prefix)
 
         # Parse response
         probability = 0.5
         matches = []
         reasoning = response
 
-        for line in response.split("\n"):
-            if line.startswith("PROBABILITY:"):
+        for field, value in _ANALYSIS_FIELD_RE.findall(response):
+            if field == "PROBABILITY":
                 try:
-                    probability = float(line.split(":")[1].strip())
-                except:
+                    probability = float(value)
+                except ValueError:
                     pass
-            elif line.startswith("MATCHES:"):
-                matches = [m.strip() for m in line.split(":")[1].split(",")]
+            else:
+                matches = [m.strip() for m in value.split(",")]
 
         return {
             "probability": probability,
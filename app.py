@@ -3,14 +3,27 @@ Diagnosaurus.ai - Main Flask Application
 Multi-agent medical symptom analysis system
 """
 import asyncio
+import atexit
+import hashlib
+import os
+import statistics
 import uuid
 import threading
 from datetime import datetime
+from operator import attrgetter
 from flask import Flask, request, jsonify, render_template, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from loguru import logger
 import sys
 
+# Optional orjson for JSON responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from config import settings
 from models.schemas import (
     SymptomAnalysisRequest,
@@ -20,9 +33,9 @@ from models.schemas import (
     Location,
 )
 from services.redis_service import RedisService
-from services.skyflow_service import skyflow_service
+from services.skyflow_service import get_skyflow_service
 from services.parallel_service import get_research_service
-from services.geoip_service import geoip_service
+from services.geoip_service import get_geoip_service, load_geoip_service
 from services.document_service import document_service
 from agents.research_agent import CoarseSearchAgent, DeepResearchAgent
 from agents.forum_coordinator import AdversarialForum
@@ -33,18 +46,120 @@ logger.remove()
 logger.add(sys.stderr, level=settings.log_level)
 logger.add(settings.log_file, rotation="500 MB", level=settings.log_level)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson - responses are encoded straight to bytes"""
+
+    @staticmethod
+    def default(o):
+        if hasattr(o, "model_dump"):
+            return o.model_dump(mode="json")
+        return DefaultJSONProvider.default(o)
+
+    # json.dumps keywords dumps() accepts - anything else raises instead of being dropped
+    _DUMPS_KWARGS = frozenset({"sort_keys", "default", "indent", "ensure_ascii", "separators"})
+
+    def _options(self, sort_keys: bool) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        """
+        Serialize to a JSON string, like DefaultJSONProvider.dumps
+
+        sort_keys (default: self.sort_keys), default and indent are honoured - indent
+        as orjson's only width, 2 spaces. ensure_ascii and separators are accepted but
+        ignored: output is always UTF-8 and compact unless indented. Other json.dumps
+        keywords raise TypeError.
+        """
+        unsupported = kwargs.keys() - self._DUMPS_KWARGS
+        if unsupported:
+            raise TypeError(f"ORJSONProvider.dumps() got unsupported arguments: {', '.join(sorted(unsupported))}")
+
+        option = self._options(kwargs.get("sort_keys", self.sort_keys))
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize JSON text or bytes, like DefaultJSONProvider.loads
+
+        orjson takes no decoding options, so any json.loads keyword raises TypeError
+        rather than being silently dropped.
+        """
+        if kwargs:
+            raise TypeError(f"ORJSONProvider.loads() got unsupported arguments: {', '.join(sorted(kwargs))}")
+        return orjson.loads(s)
+
+    def _response_options(self) -> int:
+        option = self._options(self.sort_keys) | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._response_options()),
+            mimetype=self.mimetype,
+        )
+
+
 # Initialize Flask app
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 app.config["SECRET_KEY"] = settings.secret_key
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max upload
-CORS(app)
+CORS(app, resources={r"/api/*": {"origins": "*"}})  # Only the JSON API is called cross-origin
 
 # Initialize services
 redis_service = RedisService()
-research_service = get_research_service()  # Selects Parallel.ai or fallback based on config
+research_service = get_research_service(redis_service)  # Selects Parallel.ai or fallback based on config
+
+# Long-lived event loop for analysis pipelines - HTTP connection pools stay warm across sessions
+_pipeline_loop = None
+_pipeline_loop_pid = None
+_pipeline_loop_lock = threading.Lock()
+
+
+def get_pipeline_loop() -> asyncio.AbstractEventLoop:
+    """Background event loop shared by all analysis sessions (started on first use, per process)"""
+    global _pipeline_loop, _pipeline_loop_pid
+
+    with _pipeline_loop_lock:
+        # A forked worker doesn't inherit the loop thread - start a fresh loop there
+        if _pipeline_loop is None or _pipeline_loop_pid != os.getpid():
+            _pipeline_loop = asyncio.new_event_loop()
+            _pipeline_loop_pid = os.getpid()
+            threading.Thread(
+                target=_pipeline_loop.run_forever,
+                name="pipeline-loop",
+                daemon=True,
+            ).start()
+            logger.info("Started background pipeline event loop")
+        return _pipeline_loop
+
+
+# Load the GeoIP database in the background - the first request without a location
+# shouldn't pay for it, and neither should startup
+asyncio.run_coroutine_threadsafe(load_geoip_service(), get_pipeline_loop())
+
+# Open the fallback research connections (or browser) on the pipeline loop that will use them
+if hasattr(research_service, "warmup"):
+    asyncio.run_coroutine_threadsafe(research_service.warmup(), get_pipeline_loop())
+
 
-# Store active analysis sessions
-active_sessions = {}
+@atexit.register
+def _close_research_service():
+    """Close the research service's connections (and browser) on the loop that opened them"""
+    try:
+        asyncio.run_coroutine_threadsafe(research_service.close(), get_pipeline_loop()).result(timeout=5)
+    except Exception as e:
+        logger.warning(f"Research service shutdown failed: {e}")
 
 
 @app.route("/")
@@ -72,17 +187,15 @@ def analyze_symptoms():
     Initiates multi-agent analysis pipeline
     """
     try:
-        data = request.get_json()
-
-        # Validate request
-        analysis_request = SymptomAnalysisRequest(**data)
+        # Validate request - parsed straight from the raw body (no intermediate dict)
+        analysis_request = SymptomAnalysisRequest.model_validate_json(request.get_data(cache=False))
 
         # Generate session ID
         session_id = f"session_{uuid.uuid4().hex[:16]}"
 
         # Get user location
         if not analysis_request.location:
-            location_data = geoip_service.get_location_from_request(request)
+            location_data = get_geoip_service().get_location_from_request(request)
             analysis_request.location = Location(
                 latitude=location_data.get("latitude", 0.0),
                 longitude=location_data.get("longitude", 0.0),
@@ -94,18 +207,18 @@ def analyze_symptoms():
         # Initialize session
         session_data = {
             "session_id": session_id,
-            "request": analysis_request.model_dump(),
+            # Documents stay out - every status update rewrites this payload
+            "request": analysis_request.model_dump(exclude={"documents"}),
             "status": "initializing",
             "created_at": datetime.utcnow().isoformat(),
         }
         redis_service.set_session_data(session_id, session_data)
 
-        # Start analysis in background thread
-        def run_async_pipeline():
-            asyncio.run(run_analysis_pipeline(session_id, analysis_request))
-
-        thread = threading.Thread(target=run_async_pipeline, daemon=True)
-        thread.start()
+        # Start analysis on the background event loop
+        asyncio.run_coroutine_threadsafe(
+            run_analysis_pipeline(session_id, analysis_request),
+            get_pipeline_loop(),
+        )
 
         logger.info(f"Started analysis session: {session_id}")
 
@@ -124,14 +237,16 @@ def analyze_symptoms():
 def get_analysis_status(session_id: str):
     """Poll analysis status"""
     try:
-        session_data = redis_service.get_session_data(session_id)
+        # Status and result in one round-trip - this endpoint is polled
+        session_data, result = redis_service.get_session_with_result(session_id)
 
         if not session_data:
             return jsonify({"error": "Session not found"}), 404
 
         # Get current status
         status = session_data.get("status", "unknown")
-        result = session_data.get("result")
+        if status != "completed":
+            result = None
         error = session_data.get("error")
         progress = session_data.get("progress", 0)
 
@@ -160,13 +275,17 @@ async def run_analysis_pipeline(session_id: str, request: SymptomAnalysisRequest
         logger.info(f"[{session_id}] Starting analysis pipeline")
 
         # Update status
-        update_session_status(session_id, "sanitizing", 10)
+        await update_session_status(session_id, "sanitizing", 10)
 
         # Step 1: Extract text from uploaded documents
         document_text = ""
         if request.documents:
             logger.info(f"[{session_id}] Extracting text from {len(request.documents)} documents")
-            document_text = document_service.extract_text_from_documents(request.documents)
+            # CPU-bound parsing runs off the shared event loop so other sessions keep progressing
+            document_text = await asyncio.to_thread(
+                document_service.extract_text_from_documents,
+                request.documents,
+            )
 
         # Step 2: Merge symptoms + document text
         combined_text = request.symptoms
@@ -175,49 +294,77 @@ async def run_analysis_pipeline(session_id: str, request: SymptomAnalysisRequest
             logger.info(f"[{session_id}] Combined text length: {len(combined_text)} chars")
 
         # Step 3: Sanitize PII/PHI in combined text
-        sanitized_text = skyflow_service.sanitize_text(combined_text)
+        skyflow_service = get_skyflow_service()
+        sanitized_text = await asyncio.to_thread(skyflow_service.sanitize_text, combined_text)
         logger.info(f"[{session_id}] Text sanitized (Skyflow: {skyflow_service.client is not None})")
 
+        # Identical case (same sanitized text, patient context, and area) - reuse the full analysis
+        response_cache_key = _response_cache_key(sanitized_text, request)
+        if settings.response_cache_ttl > 0:
+            cached = await asyncio.to_thread(redis_service.get_analysis_response, response_cache_key)
+            if cached:
+                cached["session_id"] = session_id
+                cached["processing_time_ms"] = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                await update_session_status(session_id, "completed", 100, result=cached)
+                logger.info(f"[{session_id}] Served cached analysis")
+                return
+
+        # Shared by every agent below
+        patient_context = {
+            "age": request.patient_age,
+            "sex": request.patient_sex,
+        }
+
         # Step 4: Coarse search - identify potential conditions
-        update_session_status(session_id, "researching", 20)
+        await update_session_status(session_id, "researching", 20)
 
-        coarse_agent = CoarseSearchAgent(parallel_service=research_service)
-        coarse_result = await coarse_agent.execute({
+        condition_queue: asyncio.Queue = asyncio.Queue()
+        coarse_agent = CoarseSearchAgent(parallel_service=research_service, redis_service=redis_service)
+        coarse_task = asyncio.create_task(coarse_agent.execute({
             "symptoms": sanitized_text,
-            "patient_context": {
-                "age": request.patient_age,
-                "sex": request.patient_sex,
-            },
-        })
+            "patient_context": patient_context,
+            "condition_queue": condition_queue,
+        }))
+
+        # Step 5: Deep research on each condition - starts as soon as the coarse search commits to it
+        try:
+            deep_agent = DeepResearchAgent(parallel_service=research_service, redis_service=redis_service)
+            research_results = await run_deep_research_batch(
+                session_id,
+                deep_agent,
+                condition_queue,
+                sanitized_text,
+                patient_context,
+            )
+
+            coarse_result = await coarse_task
+        finally:
+            # A failed or cancelled pipeline doesn't leave the coarse search running
+            await _cancel_tasks([coarse_task])
 
         potential_conditions = coarse_result["conditions"]
         logger.info(f"[{session_id}] Identified {len(potential_conditions)} potential conditions")
 
-        # Step 5: Deep research on each condition (batched)
-        update_session_status(session_id, "deep_research", 40)
-
-        research_results = await run_deep_research_batch(
-            session_id,
-            potential_conditions,
-            sanitized_text,
-            request,
-        )
+        # Conditions dispatched early can still drop out of the final list (e.g. the LLM
+        # stream failed after queueing them) - only the coarse agent's conditions go on
+        condition_keys = {c.lower().strip() for c in potential_conditions}
+        research_results = [
+            r for r in research_results
+            if (r.condition_researched or "").lower().strip() in condition_keys
+        ]
 
         # Step 6: Adversarial forum debate
-        update_session_status(session_id, "debating", 70)
+        await update_session_status(session_id, "debating", 70)
 
-        forum = AdversarialForum()
+        forum = AdversarialForum(redis_service=redis_service)
         forum_result = await forum.execute({
             "research_results": research_results,
             "symptoms": sanitized_text,
-            "patient_context": {
-                "age": request.patient_age,
-                "sex": request.patient_sex,
-            },
+            "patient_context": patient_context,
         })
 
         # Step 7: Final condition analysis and scoring
-        update_session_status(session_id, "analyzing", 85)
+        await update_session_status(session_id, "analyzing", 85)
 
         final_conditions = condition_analyzer.analyze(
             research_results,
@@ -226,7 +373,7 @@ async def run_analysis_pipeline(session_id: str, request: SymptomAnalysisRequest
         )
 
         # Step 8: Find nearby clinics
-        update_session_status(session_id, "finding_clinics", 90)
+        await update_session_status(session_id, "finding_clinics", 90)
 
         clinics = await research_service.find_clinics(
             location={
@@ -239,7 +386,9 @@ async def run_analysis_pipeline(session_id: str, request: SymptomAnalysisRequest
         # Step 9: Build final response
         processing_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
 
-        analysis_response = AnalysisResponse(
+        # Every part is an already-validated model - only the ordering is left to guarantee
+        final_conditions.sort(key=attrgetter("probability"), reverse=True)
+        analysis_response = AnalysisResponse.model_construct(
             session_id=session_id,
             conditions=final_conditions,
             clinics=clinics,
@@ -249,69 +398,151 @@ async def run_analysis_pipeline(session_id: str, request: SymptomAnalysisRequest
             warning_message=_generate_warning_message(sanitized_text, final_conditions),
         )
 
-        # Store result
-        update_session_status(
+        # Store result - serialized once by pydantic-core, stored as-is in both keys
+        result = analysis_response.model_dump_json()
+        await update_session_status(
             session_id,
             "completed",
             100,
-            result=analysis_response.model_dump(),
+            result=result,
         )
 
+        if settings.response_cache_ttl > 0:
+            await asyncio.to_thread(
+                redis_service.set_analysis_response,
+                response_cache_key,
+                result,
+                settings.response_cache_ttl,
+            )
+
         logger.info(f"[{session_id}] Analysis complete in {processing_time}ms")
 
     except Exception as e:
         logger.error(f"[{session_id}] Analysis pipeline failed: {e}")
-        update_session_status(session_id, "failed", 0, error=str(e))
+        await update_session_status(session_id, "failed", 0, error=str(e))
 
 
 async def run_deep_research_batch(
     session_id: str,
-    conditions: list,
+    deep_agent: DeepResearchAgent,
+    condition_queue: asyncio.Queue,
     symptoms: str,
-    request: SymptomAnalysisRequest,
+    patient_context: dict,
 ):
-    """Run deep research agents in batches"""
-    results = []
-    batch_size = settings.agents_batch
-
-    for i in range(0, len(conditions), batch_size):
-        batch = conditions[i:i + batch_size]
-        logger.info(f"[{session_id}] Processing batch {i//batch_size + 1}: {batch}")
-
-        # Run batch in parallel
-        tasks = []
-        for condition in batch:
-            agent = DeepResearchAgent(parallel_service=research_service)
-            task = agent.execute({
+    """
+    Run deep research agents concurrently, at most AGENTS_BATCH at a time
+
+    Conditions are consumed from condition_queue (terminated by None) while the
+    coarse search is still running. Results keep the queue's order, not the coarse
+    agent's final order, and may cover conditions that later dropped out of it (the
+    caller filters those). One agent instance serves every condition; each call still
+    reports its own agent_id.
+    Conditions queued together are web-researched together, one search per condition.
+    """
+    semaphore = asyncio.Semaphore(settings.agents_batch)
+
+    async def prefetched(batch_research: asyncio.Task, condition: str):
+        return (await batch_research)[condition]
+
+    async def research(index: int, condition: str, batch_research: asyncio.Task):
+        async with semaphore:
+            result = await deep_agent.execute({
+                "agent_id": f"agent_{uuid.uuid4().hex[:8]}",
                 "condition": condition,
                 "symptoms": symptoms,
-                "patient_context": {
-                    "age": request.patient_age,
-                    "sex": request.patient_sex,
-                },
+                "patient_context": patient_context,
+                "prefetched_research": prefetched(batch_research, condition),
             })
-            tasks.append(task)
-
-        batch_results = await asyncio.gather(*tasks)
-
-        for result in batch_results:
-            results.append(result["research_result"])
-
-        # Update progress
-        progress = 40 + int((i / len(conditions)) * 30)
-        update_session_status(session_id, "deep_research", progress)
+        return index, result["research_result"]
 
-    return results
-
-
-def update_session_status(
+    # A slow condition doesn't hold back the others - each starts as soon as a slot frees up
+    tasks = []
+    batch_tasks = []
+    try:
+        while batch := await _next_condition_batch(condition_queue):
+            if not tasks:
+                await update_session_status(session_id, "deep_research", 40)
+            logger.info(f"[{session_id}] Dispatching deep research: {', '.join(batch)}")
+            batch_research = asyncio.create_task(
+                deep_agent.research_conditions_details_batch(batch, symptoms)
+            )
+            batch_tasks.append(batch_research)
+            for condition in batch:
+                tasks.append(asyncio.create_task(research(len(tasks), condition, batch_research)))
+
+        if not tasks:
+            return []
+
+        results = [None] * len(tasks)
+        for completed, next_result in enumerate(asyncio.as_completed(tasks), 1):
+            index, research_result = await next_result
+            results[index] = research_result
+
+            # Update progress
+            progress = 40 + int((completed / len(tasks)) * 30)
+            await update_session_status(session_id, "deep_research", progress)
+
+        return results
+    finally:
+        # One failed condition (or a cancelled pipeline) stops the rest instead of orphaning them
+        await _cancel_tasks(tasks + batch_tasks)
+
+
+async def _cancel_tasks(tasks: list) -> None:
+    """Cancel any of the tasks still running and wait for them to finish unwinding"""
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+    # Also retrieves exceptions of tasks that failed unobserved
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _next_condition_batch(condition_queue: asyncio.Queue) -> list:
+    """Wait for the next condition plus any queued alongside it (empty once the queue is finished)"""
+    batch = []
+    condition = await condition_queue.get()
+    while condition is not None:
+        batch.append(condition)
+        if condition_queue.empty():
+            return batch
+        condition = condition_queue.get_nowait()
+
+    if batch:
+        condition_queue.put_nowait(None)  # Seen by the next call
+    return batch
+
+
+def _response_cache_key(sanitized_text: str, request: SymptomAnalysisRequest) -> str:
+    """Cache key for a full analysis - clinics depend on location, so it's included (~1km precision)"""
+    location = request.location
+    area = f"{location.latitude:.2f},{location.longitude:.2f}" if location else ""
+    return hashlib.sha256(
+        f"{sanitized_text}|{request.patient_age}|{request.patient_sex}|{settings.max_conditions}|{area}".encode()
+    ).hexdigest()
+
+
+async def update_session_status(
     session_id: str,
     status: str,
     progress: int,
     result=None,
     error=None,
 ):
-    """Update session status in Redis"""
+    """
+    Update session status in Redis
+
+    The result (pre-serialized JSON or a dict) lives under its own key, so
+    status ticks never re-encode it. It's written before the status flips.
+    Redis calls block, so they run off the shared pipeline loop.
+    """
+    await asyncio.to_thread(_write_session_status, session_id, status, progress, result, error)
+
+
+def _write_session_status(session_id: str, status: str, progress: int, result, error) -> None:
+    """Blocking part of update_session_status"""
+    if result:
+        redis_service.set_session_result(session_id, result)
+
     session_data = redis_service.get_session_data(session_id) or {}
     session_data.update({
         "status": status,
@@ -319,8 +550,6 @@ def update_session_status(
         "updated_at": datetime.utcnow().isoformat(),
     })
 
-    if result:
-        session_data["result"] = result
     if error:
         session_data["error"] = error
 
@@ -336,13 +565,14 @@ def _generate_warning_message(symptoms: str, conditions: list) -> str:
     if not conditions:
         return "Unable to identify specific conditions. Please provide more detailed symptoms or consult a healthcare provider."
 
-    avg_confidence = sum(c.confidence for c in conditions) / len(conditions)
+    avg_confidence = statistics.fmean(c.confidence for c in conditions)
     if avg_confidence < 0.5:
         return "Results have lower confidence due to general symptoms. These are possibilities, not diagnoses. Please consult a healthcare provider."
 
     return None
 
 
+# Development server only - production runs under gunicorn (see gunicorn.conf.py)
 if __name__ == "__main__":
     logger.info(f"Starting Diagnosaurus.ai on port {settings.port}")
     logger.info(f"Debug mode: {settings.flask_debug}")
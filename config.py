@@ -25,6 +25,12 @@ class Settings(BaseSettings):
                                        description="Use DuckDuckGo + Lightpanda/Chrome instead of Parallel.ai")
     fallback_browser: str = Field(default="lightpanda", env="FALLBACK_BROWSER",
                                  description="Browser for scraping: 'lightpanda' or 'chrome'")
+    scrape_cache_ttl: int = Field(default=86400, env="SCRAPE_CACHE_TTL",
+                                  description="TTL in seconds for cached Chrome page scrapes (0 disables)")
+    research_cache_ttl: int = Field(default=3600, env="RESEARCH_CACHE_TTL",
+                                    description="TTL in seconds for in-process condition research/search caches (0 disables)")
+    parallel_max_concurrency: int = Field(default=5, env="PARALLEL_MAX_CONCURRENCY",
+                                          description="Max Parallel.ai searches in flight at once (rate limit)")
 
     # Redis Configuration
     redis_host: str = Field(default="localhost", env="REDIS_HOST")
@@ -35,6 +41,20 @@ class Settings(BaseSettings):
     # RedisVL Configuration
     redisvl_index_name: str = Field(default="diagnosaurus_cache", env="REDISVL_INDEX_NAME")
     redisvl_similarity_threshold: float = Field(default=0.85, env="REDISVL_SIMILARITY_THRESHOLD")
+    embedding_model: str = Field(default="sentence-transformers/all-MiniLM-L6-v2", env="EMBEDDING_MODEL",
+                                 description="Local embedding model for semantic caches")
+    semantic_cache_ttl: int = Field(default=86400, env="SEMANTIC_CACHE_TTL",
+                                    description="TTL in seconds for semantic cache entries")
+    forum_semantic_cache: bool = Field(default=False, env="FORUM_SEMANTIC_CACHE",
+                                       description="Reuse debates for semantically equivalent symptoms "
+                                                   "over the same conditions")
+    forum_cache_similarity_threshold: float = Field(default=0.95, env="FORUM_CACHE_SIMILARITY_THRESHOLD",
+                                                    description="Min similarity to reuse a cached debate")
+    research_semantic_cache: bool = Field(default=False, env="RESEARCH_SEMANTIC_CACHE",
+                                          description="Reuse condition research for semantically equivalent "
+                                                      "condition/symptom queries")
+    research_cache_similarity_threshold: float = Field(default=0.95, env="RESEARCH_CACHE_SIMILARITY_THRESHOLD",
+                                                       description="Min similarity to reuse cached condition research")
 
     # Flask Configuration
     flask_env: str = Field(default="development", env="FLASK_ENV")
@@ -52,6 +72,11 @@ class Settings(BaseSettings):
                                 description="Maximum conditions to analyze")
     agents_batch: int = Field(default=2, env="AGENTS_BATCH",
                               description="Number of concurrent agents (increase to 5 for demo)")
+    forum_debate_rounds: int = Field(default=0, env="FORUM_DEBATE_ROUNDS",
+                                     description="Adversarial debate rounds (0 = skip debate for demo speed)")
+    use_batch_api: bool = Field(default=False, env="USE_BATCH_API",
+                                description="Run offline forum debates through the Message Batches API")
+    batch_poll_interval: float = Field(default=10.0, description="Seconds between Message Batch status polls")
 
     # Scoring Thresholds
     confidence_threshold: float = Field(default=0.50, env="CONFIDENCE_THRESHOLD",
@@ -79,6 +104,20 @@ class Settings(BaseSettings):
                            description="Anthropic model for agents")
     max_tokens: int = Field(default=4096, description="Max tokens per agent response")
     temperature: float = Field(default=0.7, description="LLM temperature")
+    anthropic_timeout: float = Field(default=120.0, description="Anthropic request timeout in seconds")
+    anthropic_max_connections: int = Field(default=100,
+                                           description="Connection pool size of the shared Anthropic client")
+
+    # LLM Response Cache
+    llm_cache_ttl: int = Field(default=3600, env="LLM_CACHE_TTL",
+                               description="TTL in seconds for cached LLM completions")
+    llm_semantic_cache: bool = Field(default=False, env="LLM_SEMANTIC_CACHE",
+                                     description="Also reuse completions for prompts within "
+                                                 "REDISVL_SIMILARITY_THRESHOLD of a cached one")
+
+    # Analysis Response Cache
+    response_cache_ttl: int = Field(default=1800, env="RESPONSE_CACHE_TTL",
+                                    description="TTL in seconds for cached analysis responses (0 disables)")
 
     # Session Configuration
     session_timeout: int = Field(default=3600, description="Session TTL in seconds (1 hour)")
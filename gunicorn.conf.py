@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for Diagnosaurus.ai
+
+Usage: gunicorn -c gunicorn.conf.py app:app
+
+Threaded workers rather than gevent - each worker runs analysis pipelines on
+its own background asyncio loop thread (see app.get_pipeline_loop), which
+gevent's monkey-patching would interfere with. Request threads only parse
+input and poll Redis, so they never hold a slot for a whole analysis.
+"""
+import os
+
+from config import settings
+
+bind = f"0.0.0.0:{settings.port}"
+
+worker_class = "gthread"
+
+# Few workers on purpose: each one holds its own pipeline loop, embedding model, GeoIP DB,
+# research/scrape caches, PDF process pool and (FALLBACK_BROWSER=chrome) Chromium, so
+# memory grows linearly with WEB_CONCURRENCY. Concurrency comes from the threads and the
+# async pipeline loop, not from the worker count (the 2n+1 rule is for cheap sync workers).
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+
+# Sessions live in Redis, so any worker can answer /api/status polls.
+# Not preloaded - Redis clients and the pipeline loop are created per worker.
+preload_app = False
+
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+loglevel = settings.log_level.lower()
@@ -2,9 +2,15 @@
 Pydantic schemas for Diagnosaurus.ai
 Type-safe data models with validation
 """
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
-from datetime import datetime
+from functools import cached_property
+from typing import List, Optional, Dict, Any, TypedDict
+from pydantic import Base64Bytes, BaseModel, Field, TypeAdapter, computed_field, field_validator
+from datetime import datetime, timezone
+
+
+def _now_utc() -> datetime:
+    """Timezone-aware UTC now - shared default_factory for every timestamp field"""
+    return datetime.now(timezone.utc)
 
 
 class Location(BaseModel):
@@ -19,13 +25,14 @@ class Location(BaseModel):
 class SymptomAnalysisRequest(BaseModel):
     """Request payload for symptom analysis"""
     symptoms: str = Field(..., min_length=10, description="Patient symptom description")
-    documents: List[str] = Field(default_factory=list, description="Base64 encoded medical documents")
+    documents: List[Base64Bytes] = Field(default_factory=list, description="Base64 encoded medical documents (decoded on validation)")
     location: Optional[Location] = None
     patient_age: Optional[int] = Field(None, ge=0, le=120)
     patient_sex: Optional[str] = Field(None, pattern="^(male|female|other)$")
     medical_history: Optional[str] = None
 
-    @validator("symptoms")
+    @field_validator("symptoms")
+    @classmethod
     def validate_symptoms(cls, v):
         """Ensure symptoms are meaningful"""
         if len(v.strip()) < 10:
@@ -38,7 +45,15 @@ class ConditionEvidence(BaseModel):
     source: str = Field(..., description="Evidence source (LLM/Parallel.ai/Forum)")
     content: str = Field(..., description="Evidence text")
     relevance_score: float = Field(..., ge=0, le=1, description="How relevant to condition")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_now_utc)
+
+
+class ConditionEvidenceDict(TypedDict, total=False):
+    """Unvalidated ConditionEvidence used inside the pipeline"""
+    source: str
+    content: str
+    relevance_score: float
+    timestamp: datetime
 
 
 class MedicalCondition(BaseModel):
@@ -54,7 +69,8 @@ class MedicalCondition(BaseModel):
     recommended_tests: List[str] = Field(default_factory=list)
     urgency: str = Field(default="routine", pattern="^(emergency|urgent|routine|monitor)$")
 
-    @validator("probability", "confidence")
+    @field_validator("probability", "confidence")
+    @classmethod
     def validate_scores(cls, v):
         """Ensure scores are valid probabilities"""
         if not 0 <= v <= 1:
@@ -62,6 +78,20 @@ class MedicalCondition(BaseModel):
         return v
 
 
+class MedicalConditionDict(TypedDict, total=False):
+    """Unvalidated MedicalCondition used inside the pipeline - validated once on the way out"""
+    name: str
+    probability: float
+    confidence: float
+    body_region: str
+    evidence_summary: str
+    evidence_details: List[ConditionEvidenceDict]
+    position: Dict[str, int]
+    symptoms_matched: List[str]
+    recommended_tests: List[str]
+    urgency: str
+
+
 class ClinicResult(BaseModel):
     """Clinic search result"""
     name: str = Field(..., description="Clinic/provider name")
@@ -76,9 +106,10 @@ class ClinicResult(BaseModel):
     website: Optional[str] = None
     next_available: Optional[str] = Field(None, description="Next appointment slot")
 
-    @property
+    @computed_field
+    @cached_property
     def doctor_last_name_blurred(self) -> str:
-        """Return doctor name with last name blurred"""
+        """Return doctor name with last name blurred (computed once, included in dumps)"""
         parts = self.doctor_name.split()
         if len(parts) > 1:
             return f"{parts[0]} {parts[-1][0]}***"
@@ -94,7 +125,7 @@ class AgentResearchResult(BaseModel):
     sources: List[str] = Field(default_factory=list, description="Information sources")
     confidence: float = Field(..., ge=0, le=1)
     reasoning: str = Field(..., description="Agent reasoning process")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_now_utc)
     processing_time_ms: int = Field(..., ge=0)
 
 
@@ -115,13 +146,14 @@ class AnalysisResponse(BaseModel):
     clinics: List[ClinicResult] = Field(default_factory=list, description="Nearby clinics")
     agent_research: List[AgentResearchResult] = Field(default_factory=list)
     forum_debate: Optional[ForumDebateResult] = None
-    analysis_timestamp: datetime = Field(default_factory=datetime.utcnow)
+    analysis_timestamp: datetime = Field(default_factory=_now_utc)
     processing_time_ms: int = Field(..., ge=0)
     warning_message: Optional[str] = Field(None, description="General symptom warning")
 
-    @validator("conditions")
+    @field_validator("conditions")
+    @classmethod
     def validate_conditions(cls, v):
-        """Ensure conditions are sorted by probability"""
+        """Ensure conditions are sorted by probability (internal callers pre-sort and use model_construct)"""
         return sorted(v, key=lambda x: x.probability, reverse=True)
 
 
@@ -145,3 +177,26 @@ class SessionStatus(BaseModel):
     estimated_time_remaining_seconds: Optional[int] = None
     result: Optional[AnalysisResponse] = None
     error: Optional[str] = None
+
+
+# Make sure every schema is fully built at import - a model left incomplete (e.g. by a
+# forward reference) would otherwise build its pydantic-core schema on the first request.
+# model_rebuild() returns immediately for models that are already complete.
+for _model in (
+    Location,
+    SymptomAnalysisRequest,
+    ConditionEvidence,
+    MedicalCondition,
+    ClinicResult,
+    AgentResearchResult,
+    ForumDebateResult,
+    AnalysisResponse,
+    AgentStatus,
+    SessionStatus,
+):
+    _model.model_rebuild(raise_errors=True)
+del _model
+
+# Pre-built list validators/serializers - built once at import, reused on every request
+CONDITIONS_ADAPTER = TypeAdapter(List[MedicalCondition])
+CLINICS_ADAPTER = TypeAdapter(List[ClinicResult])
@@ -0,0 +1,74 @@
+"""
+Research field extraction shared by the research services
+"""
+from typing import List, Dict, Any, Optional
+from .keyword_extraction import keyword_sentences
+
+# Characters of each result scanned for keywords - medical content worth extracting sits
+# near the top, and huge pages would otherwise make extraction cost grow with page size
+MAX_EXTRACT_LEN = 20_000
+
+
+class ResearchExtractorMixin:
+    """
+    Mixin turning search results into structured research fields
+
+    Services differ only in where the overview and the diagnosis/treatment text
+    come from; they override _overview_excerpt / _field_excerpt for that.
+    """
+
+    def _overview_excerpt(self, content: str, found: Dict[str, List[str]]) -> Optional[str]:
+        """Overview from one result, or None to keep looking (default: a result mentioning "overview")"""
+        return content[:500] if "overview" in found else None
+
+    def _field_excerpt(self, content: str, sentences: List[str]) -> str:
+        """Diagnosis/treatment text from a result mentioning it (default: the start of the result)"""
+        return content[:300]
+
+    def extract_all(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Extract overview, symptoms, causes, risk factors, diagnosis and treatment
+
+        One regex pass per result finds every keyword and the sentences holding it,
+        instead of lower-casing, splitting and re-scanning the content per field.
+
+        Args:
+            results: Search results (internal format)
+
+        Returns:
+            Dict of extracted research fields
+        """
+        overview = diagnosis = treatment = None
+        symptoms, causes, risk_factors = [], [], []
+
+        for result in results:
+            content = (result.get("content") or "")[:MAX_EXTRACT_LEN]
+            found = keyword_sentences(content)
+
+            if overview is None:
+                overview = self._overview_excerpt(content, found)
+            if not found:
+                continue
+
+            if diagnosis is None and "diagnos" in found:
+                diagnosis = self._field_excerpt(content, found["diagnos"])
+            if treatment is None and "treatment" in found:
+                treatment = self._field_excerpt(content, found["treatment"])
+
+            # Simple sentence extraction - could be enhanced with NLP
+            symptoms.extend(found.get("symptom", ()))
+            causes.extend(found.get("cause", ()))
+            if "risk_factor" in found:
+                risk_factors.extend(found["risk"])
+
+        if overview is None:
+            overview = results[0].get("content", "")[:500] if results else ""
+
+        return {
+            "overview": overview,
+            "symptoms": symptoms[:10],  # Top 10 symptoms
+            "causes": causes[:5],
+            "risk_factors": risk_factors[:5],
+            "diagnosis": diagnosis or "",
+            "treatment": treatment or "",
+        }
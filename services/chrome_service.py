@@ -2,35 +2,169 @@
 Chrome browser scraping service using Playwright
 Provides better website compatibility than headless solutions
 """
-from typing import Dict, Any, Optional
+import asyncio
+import importlib.util
+import re
+from typing import TYPE_CHECKING, Dict, Any, Optional, Callable, Awaitable
 from loguru import logger
+from config import settings
+from .redis_service import RedisService, loads
+from .research_cache import canonical_url
 
-try:
-    from playwright.async_api import async_playwright, Browser, Page
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+
+# Playwright itself is imported on first launch - importing it here slows every `import services`
+PLAYWRIGHT_AVAILABLE = importlib.util.find_spec("playwright") is not None
+if not PLAYWRIGHT_AVAILABLE:
     logger.warning("Playwright not installed. Run: pip install playwright && playwright install chrome")
 
+# Common navigation/footer text on medical sites
+NOISE_PATTERNS = [
+    "Cookie Policy",
+    "Privacy Policy",
+    "Terms of Service",
+    "Terms and Conditions",
+    "Subscribe to our newsletter",
+    "Sign up for our newsletter",
+    "Share on Facebook",
+    "Share on Twitter",
+    "Share on LinkedIn",
+    "Follow us on",
+    "Download our app",
+]
+
+# Browser contexts kept warm and reused across scrapes (also caps concurrent pages)
+CONTEXT_POOL_SIZE = 4
+
+# Requests that never contribute text - aborted before any bytes are fetched
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# Plain-text scrapes only read the server-rendered DOM, so scripts can go too
+TEXT_MODE_BLOCKED_RESOURCE_TYPES = BLOCKED_RESOURCE_TYPES | {"script"}
+
+# Page metadata plus content ("markdown", "text" or "html") - evaluated in one call
+_EXTRACT_PAGE_JS = """
+(mode) => {
+    const toMarkdown = () => {
+        // Try to find main content area
+        const mainContent =
+            document.querySelector('article') ||
+            document.querySelector('main') ||
+            document.querySelector('[role="main"]') ||
+            document.querySelector('.content') ||
+            document.querySelector('.article') ||
+            document.body;
+
+        if (!mainContent) return '';
+
+        let markdown = '';
+
+        // Extract headings and paragraphs
+        mainContent.querySelectorAll('h1, h2, h3, h4, p, ul, ol').forEach(el => {
+            const tag = el.tagName.toLowerCase();
+            const text = el.innerText.trim();
+
+            if (!text) return;
+
+            if (tag === 'h1') {
+                markdown += '# ' + text + '\\n\\n';
+            } else if (tag === 'h2') {
+                markdown += '## ' + text + '\\n\\n';
+            } else if (tag === 'h3') {
+                markdown += '### ' + text + '\\n\\n';
+            } else if (tag === 'h4') {
+                markdown += '#### ' + text + '\\n\\n';
+            } else if (tag === 'p') {
+                markdown += text + '\\n\\n';
+            } else {
+                el.querySelectorAll('li').forEach(li => {
+                    markdown += '- ' + li.innerText.trim() + '\\n';
+                });
+                markdown += '\\n';
+            }
+        });
+
+        return markdown;
+    };
+
+    let content;
+    if (mode === 'html') {
+        content = new XMLSerializer().serializeToString(document);
+    } else if (mode === 'text') {
+        content = document.body.innerText;
+    } else {
+        content = toMarkdown();
+    }
+
+    // One JSON string crosses the CDP pipe - cheaper than Playwright's per-value serialization
+    return JSON.stringify({
+        title: document.title,
+        content: content,
+        meta_description: document.querySelector('meta[name="description"]')?.content || '',
+        headings: Array.from(document.querySelectorAll('h1, h2, h3'), h => h.innerText).slice(0, 10),
+    });
+}
+"""
+
+# Installed into every document of the pooled contexts, so CDP only parses the extractor once
+# per page load and each scrape sends a one-line call instead of the whole source
+_EXTRACT_PAGE_INIT_JS = f"window.__diagnosaurusExtractPage = {_EXTRACT_PAGE_JS.strip()};"
+_CALL_EXTRACT_PAGE_JS = (
+    "(mode) => window.__diagnosaurusExtractPage ? window.__diagnosaurusExtractPage(mode) : null"
+)
+
+# One pass over the content instead of one str.replace scan per pattern
+_NOISE_RE = re.compile("|".join(re.escape(pattern) for pattern in NOISE_PATTERNS))
+
+
+async def _block_resources(route):
+    """Context-wide route handler: drop images, media, fonts and stylesheets"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _block_resources_text_mode(route):
+    """Page-level route handler for text scrapes: also drop scripts"""
+    if route.request.resource_type in TEXT_MODE_BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 
 class ChromeService:
     """Chrome browser scraping service using Playwright"""
 
-    def __init__(self):
-        """Initialize Chrome service"""
+    def __init__(self, redis_service: Optional[RedisService] = None):
+        """
+        Initialize Chrome service
+
+        Args:
+            redis_service: Cache for scraped pages (a new connection is made if omitted)
+        """
         if not PLAYWRIGHT_AVAILABLE:
             raise ImportError(
                 "Playwright is required for Chrome scraping. "
                 "Install with: pip install playwright && playwright install chrome"
             )
 
-        self.browser: Optional[Browser] = None
+        self.browser: Optional["Browser"] = None
         self.playwright = None
+        self._context_pool: Optional[asyncio.Queue] = None
+        self._launch_lock = asyncio.Lock()
+        self.redis_service = redis_service or RedisService()
         logger.info("Chrome scraping service initialized")
 
     async def _ensure_browser(self):
-        """Ensure browser is launched"""
-        if self.browser is None:
+        """Ensure browser is launched and the context pool is warm"""
+        async with self._launch_lock:
+            if self.browser is not None:
+                return
+
+            from playwright.async_api import async_playwright
+
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(
                 headless=True,
@@ -42,13 +176,31 @@ class ChromeService:
                     '--disable-gpu',
                 ]
             )
-            logger.info("Chrome browser launched")
+
+            # browser.new_page() builds (and tears down) a whole context per scrape
+            contexts = await asyncio.gather(
+                *(self.browser.new_context(java_script_enabled=True) for _ in range(CONTEXT_POOL_SIZE))
+            )
+            self._context_pool = asyncio.Queue()
+            for context in contexts:
+                await context.route("**/*", _block_resources)
+                await context.add_init_script(_EXTRACT_PAGE_INIT_JS)
+                self._context_pool.put_nowait(context)
+
+            logger.info(f"Chrome browser launched ({CONTEXT_POOL_SIZE} pooled contexts)")
+
+    async def warmup(self):
+        """Launch the browser and its context pool ahead of the first scrape"""
+        try:
+            await self._ensure_browser()
+        except Exception as e:
+            logger.warning(f"Chrome warmup failed: {e}")
 
     async def scrape_url(
         self,
         url: str,
         extract_mode: str = "markdown",
-        wait_for: str = "networkidle",
+        wait_for: str = "domcontentloaded",
         timeout: int = 15000,
     ) -> Dict[str, Any]:
         """
@@ -57,7 +209,8 @@ class ChromeService:
         Args:
             url: URL to scrape
             extract_mode: Extraction mode - "markdown", "text", or "html"
-            wait_for: Wait condition - "networkidle", "load", or "domcontentloaded"
+            wait_for: Wait condition - "domcontentloaded" (default - medical pages are mostly static),
+                "load", or "networkidle"
             timeout: Timeout in milliseconds
 
         Returns:
@@ -66,45 +219,40 @@ class ChromeService:
         try:
             await self._ensure_browser()
 
-            page: Page = await self.browser.new_page()
+            context: "BrowserContext" = await self._context_pool.get()
+            page: Optional["Page"] = None
 
             try:
+                page = await context.new_page()
+                if extract_mode == "text":
+                    # Page routes take precedence over the context-wide handler
+                    await page.route("**/*", _block_resources_text_mode)
+
                 # Navigate to URL
                 await page.goto(url, wait_until=wait_for, timeout=timeout)
 
-                # Extract metadata
-                title = await page.title()
-
-                # Extract main content based on mode
-                if extract_mode == "html":
-                    content = await page.content()
-                elif extract_mode == "text":
-                    content = await page.inner_text("body")
-                else:  # markdown mode - extract structured content
-                    content = await self._extract_markdown(page)
-
-                # Extract meta description
-                meta_desc = await page.evaluate(
-                    "() => document.querySelector('meta[name=\"description\"]')?.content || ''"
-                )
-
-                # Extract headings
-                headings = await page.evaluate("""
-                    () => {
-                        const headings = [];
-                        document.querySelectorAll('h1, h2, h3').forEach(h => {
-                            headings.push(h.innerText);
-                        });
-                        return headings;
+                # Title, meta description, headings and content in one CDP round-trip
+                try:
+                    payload = await page.evaluate(_CALL_EXTRACT_PAGE_JS, extract_mode)
+                    if payload is None:
+                        # The page replaced window - fall back to sending the full source
+                        payload = await page.evaluate(_EXTRACT_PAGE_JS, extract_mode)
+                    data = loads(payload)
+                except Exception as e:
+                    logger.warning(f"Page extraction failed, falling back to text: {e}")
+                    data = {
+                        "title": await page.title(),
+                        "content": await page.inner_text("body"),
+                        "meta_description": "",
+                        "headings": [],
                     }
-                """)
 
                 result = {
                     "url": url,
-                    "title": title,
-                    "content": content,
-                    "meta_description": meta_desc,
-                    "headings": headings[:10],  # Limit to top 10
+                    "title": data["title"],
+                    "content": data["content"],
+                    "meta_description": data["meta_description"],
+                    "headings": data["headings"],
                     "success": True,
                 }
 
@@ -112,7 +260,9 @@ class ChromeService:
                 return result
 
             finally:
-                await page.close()
+                if page is not None:
+                    await page.close()
+                self._context_pool.put_nowait(context)
 
         except Exception as e:
             logger.error(f"Chrome scraping failed for {url}: {e}")
@@ -123,86 +273,37 @@ class ChromeService:
                 "error": str(e),
             }
 
-    async def _extract_markdown(self, page: Page) -> str:
-        """
-        Extract content in markdown-like format
-
-        Args:
-            page: Playwright page object
-
-        Returns:
-            Markdown-formatted content
-        """
-        try:
-            # Extract main content areas (article, main, or body)
-            content = await page.evaluate("""
-                () => {
-                    // Try to find main content area
-                    const mainContent =
-                        document.querySelector('article') ||
-                        document.querySelector('main') ||
-                        document.querySelector('[role="main"]') ||
-                        document.querySelector('.content') ||
-                        document.querySelector('.article') ||
-                        document.body;
-
-                    if (!mainContent) return '';
-
-                    let markdown = '';
-
-                    // Extract headings and paragraphs
-                    const elements = mainContent.querySelectorAll('h1, h2, h3, h4, p, ul, ol');
-
-                    elements.forEach(el => {
-                        const tag = el.tagName.toLowerCase();
-                        const text = el.innerText.trim();
-
-                        if (!text) return;
-
-                        if (tag === 'h1') {
-                            markdown += '# ' + text + '\\n\\n';
-                        } else if (tag === 'h2') {
-                            markdown += '## ' + text + '\\n\\n';
-                        } else if (tag === 'h3') {
-                            markdown += '### ' + text + '\\n\\n';
-                        } else if (tag === 'h4') {
-                            markdown += '#### ' + text + '\\n\\n';
-                        } else if (tag === 'p') {
-                            markdown += text + '\\n\\n';
-                        } else if (tag === 'ul' || tag === 'ol') {
-                            const items = el.querySelectorAll('li');
-                            items.forEach(li => {
-                                markdown += '- ' + li.innerText.trim() + '\\n';
-                            });
-                            markdown += '\\n';
-                        }
-                    });
-
-                    return markdown;
-                }
-            """)
-
-            return content
-
-        except Exception as e:
-            logger.warning(f"Markdown extraction failed, falling back to text: {e}")
-            return await page.inner_text("body")
-
     async def scrape_medical_content(
         self,
         url: str,
+        limit: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
     ) -> Dict[str, Any]:
         """
         Scrape medical content with optimized extraction
 
         Args:
             url: Medical page URL
+            limit: Optional wrapper run around the page load only (not cache hits),
+                e.g. a concurrency slot plus timeout; called with a zero-arg coroutine factory
 
         Returns:
             Extracted medical content
         """
+        # Medical pages rarely change - the same URLs surface across many agent queries
+        # (keyed on the canonical URL so www./utm variants share one entry)
+        cache_key = canonical_url(url)
+        if settings.scrape_cache_ttl > 0:
+            # Sync Redis client - keep the round-trip off the event loop
+            cached = await asyncio.to_thread(self.redis_service.get_scraped_page, cache_key)
+            if cached:
+                logger.debug(f"Scrape cache hit: {url}")
+                return cached
+
         # Use markdown mode for better structured content
-        result = await self.scrape_url(url, extract_mode="markdown")
+        def scrape():
+            return self.scrape_url(url, extract_mode="markdown")
+
+        result = await (limit(scrape) if limit else scrape())
 
         # Additional medical-specific processing
         if result.get("success"):
@@ -212,6 +313,11 @@ class ChromeService:
             content = self._clean_medical_content(content)
             result["content"] = content
 
+            if settings.scrape_cache_ttl > 0:
+                await asyncio.to_thread(
+                    self.redis_service.set_scraped_page, cache_key, result, settings.scrape_cache_ttl
+                )
+
         return result
 
     def _clean_medical_content(self, content: str) -> str:
@@ -224,30 +330,15 @@ class ChromeService:
         Returns:
             Cleaned content
         """
-        # Remove common navigation/footer text
-        noise_patterns = [
-            "Cookie Policy",
-            "Privacy Policy",
-            "Terms of Service",
-            "Terms and Conditions",
-            "Subscribe to our newsletter",
-            "Sign up for our newsletter",
-            "Share on Facebook",
-            "Share on Twitter",
-            "Share on LinkedIn",
-            "Follow us on",
-            "Download our app",
-        ]
-
-        for pattern in noise_patterns:
-            content = content.replace(pattern, "")
-
-        return content.strip()
+        return _NOISE_RE.sub("", content).strip()
 
     async def close(self):
         """Close browser and cleanup"""
         if self.browser:
+            # Closing the browser closes the pooled contexts with it
             await self.browser.close()
+            self.browser = None
+            self._context_pool = None
             logger.info("Chrome browser closed")
 
         if self.playwright:
@@ -1,21 +1,93 @@
 """
 DuckDuckGo search service for fallback medical research
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from html import unescape
+from urllib.parse import parse_qs, urlparse
 import asyncio
+import re
 import time
-from duckduckgo_search import DDGS
+import httpx
 from loguru import logger
 
+DDG_HTML_URL = "https://html.duckduckgo.com/html/"
+
+# Agents repeat the same queries across rounds - keep recent results in-process
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 600  # seconds
+
+# Result title links and snippets of the HTML endpoint, in page order
+_RESULT_RE = re.compile(
+    r'<a([^>]*)class="result__(a|snippet)"([^>]*)>(.*?)</a>',
+    re.DOTALL,
+)
+_HREF_RE = re.compile(r'href="([^"]*)"')
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# One keep-alive pool for the whole process, shared by every service instance
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Process-wide HTTP client for DuckDuckGo (created on first use)"""
+    global _shared_client
+
+    if _shared_client is None:
+        _shared_client = httpx.AsyncClient(
+            # Bounded like a connector pool; idle sockets are kept long enough that hot
+            # searches skip DNS resolution and connection setup entirely. One retry, on
+            # connection errors only.
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=300),
+                retries=1,
+            ),
+            headers={
+                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+                "Referer": "https://html.duckduckgo.com/",
+            },
+            timeout=10.0,
+        )
+    return _shared_client
+
 
 class DuckDuckGoService:
-    """DuckDuckGo search service using duckduckgo-search library"""
+    """DuckDuckGo search service using the HTML endpoint over a pooled async client"""
 
     def __init__(self):
         """Initialize DuckDuckGo service"""
         logger.info("DuckDuckGo service initialized")
         self._last_request_time = 0
         self._min_request_interval = 2.0  # Minimum seconds between requests
+        # (normalized query, max_results) -> (expiry, results), least recently used first
+        self._search_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+    def _get_cached_search(self, key: Tuple[str, int]) -> Optional[List[Dict[str, Any]]]:
+        """Return unexpired cached results for a search key"""
+        entry = self._search_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, results = entry
+        if expires_at < time.monotonic():
+            del self._search_cache[key]
+            return None
+        self._search_cache.move_to_end(key)
+        return list(results)
+
+    def _set_cached_search(self, key: Tuple[str, int], results: List[Dict[str, Any]]):
+        """Cache search results, evicting the least recently used entry when full"""
+        self._search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, results)
+        self._search_cache.move_to_end(key)
+        if len(self._search_cache) > SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+
+    async def warmup(self):
+        """Open a pooled connection to DuckDuckGo ahead of the first search (DNS + TCP + TLS)"""
+        try:
+            await _get_client().head(DDG_HTML_URL, timeout=5.0)
+            logger.debug("DuckDuckGo connection warmed up")
+        except Exception as e:
+            logger.debug(f"DuckDuckGo warmup failed: {e}")
 
     async def _rate_limit_delay(self):
         """Ensure minimum time between requests"""
@@ -41,27 +113,27 @@ class DuckDuckGoService:
         Returns:
             List of search results with title, url, and snippet (empty list on error)
         """
+        cache_key = (" ".join(query.lower().split()), max_results)
+        cached = self._get_cached_search(cache_key)
+        if cached is not None:
+            logger.debug(f"DuckDuckGo cache hit for: {query}")
+            return cached
+
         try:
             # Rate limit our requests
             await self._rate_limit_delay()
 
-            # Use text search with asyncio (run sync method in thread pool)
-            # Create new DDGS instance per request to avoid state issues
-            results_raw = await asyncio.to_thread(
-                lambda: list(DDGS().text(query, max_results=max_results))
-            )
-
-            # Convert to our format
-            results = []
-            for item in results_raw:
-                result = {
-                    "title": item.get("title", ""),
-                    "url": item.get("href", ""),
-                    "snippet": item.get("body", ""),
-                }
-                results.append(result)
+            response = await _get_client().post(DDG_HTML_URL, data={"q": query})
+            if response.status_code != 200:
+                # DDG answers throttled clients with 202/403 and a challenge page
+                raise RuntimeError(f"Ratelimit (HTTP {response.status_code})")
+
+            results = self._parse_results(response.text)[:max_results]
 
             logger.info(f"DuckDuckGo found {len(results)} results for: {query}")
+            # Empty pages (and errors below) aren't cached so they can't poison later lookups
+            if results:
+                self._set_cached_search(cache_key, results)
             return results
 
         except Exception as e:
@@ -73,6 +145,31 @@ class DuckDuckGoService:
                 logger.warning(f"DuckDuckGo search failed: {e}")
             return []
 
+    @staticmethod
+    def _parse_results(html: str) -> List[Dict[str, Any]]:
+        """Extract title/url/snippet results from a DDG HTML results page"""
+        results = []
+        current = None  # Result the next snippet belongs to (None after an ad)
+        for match in _RESULT_RE.finditer(html):
+            attrs, kind, text = match.group(1) + match.group(3), match.group(2), match.group(4)
+            text = unescape(_TAG_RE.sub("", text)).strip()
+
+            if kind == "a":
+                href = _HREF_RE.search(attrs)
+                url = unescape(href.group(1)) if href else ""
+                current = None
+                # Organic links are wrapped in a /l/?uddg=<target> redirect; ads go through /y.js
+                if "/y.js?" in url:
+                    continue
+                if "/l/?" in url:
+                    url = parse_qs(urlparse(url).query).get("uddg", [url])[0]
+                current = {"title": text, "url": url, "snippet": ""}
+                results.append(current)
+            elif current is not None and not current["snippet"]:
+                current["snippet"] = text
+
+        return results
+
     async def search_medical(
         self,
         query: str,
@@ -94,5 +191,9 @@ class DuckDuckGoService:
         return await self.search(medical_query, max_results)
 
     async def close(self):
-        """Close async client"""
-        pass  # AsyncDDGS handles cleanup automatically
+        """Close the shared async client (process-wide - only call on shutdown)"""
+        global _shared_client
+
+        if _shared_client is not None:
+            client, _shared_client = _shared_client, None
+            await client.aclose()
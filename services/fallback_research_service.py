@@ -2,15 +2,39 @@
 Fallback research service using DuckDuckGo + Lightpanda.io/Chrome
 This provides a free alternative to Parallel.ai for medical research
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 import asyncio
 from loguru import logger
+from config import settings
 from .duckduckgo_service import DuckDuckGoService
 from .lightpanda_service import LightpandaService
 from .chrome_service import ChromeService
+from .redis_service import RedisService
+from ._research_extractor import ResearchExtractorMixin
+from .research_cache import (
+    ResearchCache,
+    canonical_url,
+    condition_cache_key,
+    is_cacheable_research,
+    search_cache_key,
+)
 
 
-class FallbackResearchService:
+# Pages scraped at once across all searches (each one holds a browser page/API call)
+SCRAPE_CONCURRENCY = 5
+
+# Seconds one scrape may take before the result falls back to its search snippet
+SCRAPE_TIMEOUT = 8.0
+
+# Pages scraped per search (distinct pages among the top results)
+PAGES_TO_SCRAPE = 3
+
+# Condition research query, formatted with the condition name (one query - DuckDuckGo
+# rate-limits, so no per-aspect sub-queries here)
+CONDITION_QUERY_TEMPLATE = "{name} symptoms causes treatment diagnosis"
+
+
+class FallbackResearchService(ResearchExtractorMixin):
     """
     Fallback medical research service
     Uses DuckDuckGo for search + Lightpanda.io/Chrome for content scraping
@@ -19,7 +43,8 @@ class FallbackResearchService:
     def __init__(
         self,
         lightpanda_api_key: Optional[str] = None,
-        browser: str = "lightpanda"
+        browser: str = "lightpanda",
+        redis_service: Optional[RedisService] = None,
     ):
         """
         Initialize fallback research service
@@ -27,18 +52,23 @@ class FallbackResearchService:
         Args:
             lightpanda_api_key: Optional Lightpanda.io API key
             browser: Browser to use for scraping - "lightpanda" or "chrome"
+            redis_service: Shared Redis service for the Chrome page cache
         """
         self.ddg = DuckDuckGoService()
         self.browser_type = browser.lower()
 
         # Initialize appropriate scraper based on browser selection
         if self.browser_type == "chrome":
-            self.scraper = ChromeService()
+            self.scraper = ChromeService(redis_service=redis_service)
             logger.info("Fallback research service initialized (DuckDuckGo + Chrome)")
         else:
             self.scraper = LightpandaService(api_key=lightpanda_api_key)
             logger.info("Fallback research service initialized (DuckDuckGo + Lightpanda)")
 
+        self._scrape_semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+        self._search_cache = ResearchCache(ttl=settings.research_cache_ttl)
+        self._research_cache = ResearchCache(ttl=settings.research_cache_ttl)
+
     async def search_medical(
         self,
         query: str,
@@ -56,6 +86,13 @@ class FallbackResearchService:
         Returns:
             List of search results with scraped content
         """
+        return await self._search_cache.get_or_compute(
+            search_cache_key(query, max_results),
+            lambda: self._search_medical_uncached(query, max_results),
+        )
+
+    async def _search_medical_uncached(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Search and scrape without consulting the cache (empty list on error)"""
         try:
             # Step 1: Get search results from DuckDuckGo
             logger.info(f"Searching DuckDuckGo for: {query}")
@@ -65,21 +102,28 @@ class FallbackResearchService:
                 logger.warning(f"No DuckDuckGo results for: {query}")
                 return []
 
-            # Step 2: Scrape first 3 results in parallel
-            urls_to_scrape = [r["url"] for r in search_results[:3] if r.get("url")]
+            # Step 2: Scrape the first 3 distinct pages in parallel - mirrors of one page
+            # (www./trailing slash/utm params) are scraped once
+            urls_to_scrape: Dict[str, str] = {}  # canonical URL -> URL to scrape
+            for result in search_results[:PAGES_TO_SCRAPE + 2]:
+                url = result.get("url")
+                if url:
+                    urls_to_scrape.setdefault(canonical_url(url), url)
+                if len(urls_to_scrape) >= PAGES_TO_SCRAPE:
+                    break
 
             logger.info(f"Scraping {len(urls_to_scrape)} URLs in parallel with {self.browser_type}")
-            scrape_tasks = [
-                self.scraper.scrape_medical_content(url)
-                for url in urls_to_scrape
-            ]
+            scrape_tasks = [self._bounded_scrape(url) for url in urls_to_scrape.values()]
 
-            scraped_contents = await asyncio.gather(*scrape_tasks, return_exceptions=True)
+            scraped_contents = dict(zip(
+                urls_to_scrape,
+                await asyncio.gather(*scrape_tasks, return_exceptions=True),
+            ))
 
             # Step 3: Merge search results with scraped content
             enriched_results = []
 
-            for i, result in enumerate(search_results):
+            for result in search_results:
                 enriched = {
                     "title": result.get("title", ""),
                     "url": result.get("url", ""),
@@ -88,10 +132,10 @@ class FallbackResearchService:
                     "citation": result.get("url", ""),
                 }
 
-                # If this URL was scraped, use the full content
-                if i < len(scraped_contents):
-                    scraped = scraped_contents[i]
-                    if not isinstance(scraped, Exception) and scraped.get("success"):
+                # If this URL was scraped, use the full content (failed/timed-out scrapes keep the snippet)
+                if result.get("url"):
+                    scraped = scraped_contents.get(canonical_url(result["url"]))
+                    if scraped is not None and not isinstance(scraped, Exception) and scraped.get("success"):
                         enriched["content"] = scraped.get("content", result.get("snippet", ""))
                         enriched["title"] = scraped.get("title") or result.get("title", "")
 
@@ -104,6 +148,34 @@ class FallbackResearchService:
             logger.error(f"Fallback medical search failed: {e}")
             return []
 
+    async def warmup(self):
+        """Warm the search and scraper connections so the first patient query doesn't pay for them"""
+        await asyncio.gather(self.ddg.warmup(), self.scraper.warmup())
+
+    async def _bounded_scrape(self, url: str) -> Dict[str, Any]:
+        """
+        Scrape one page, bounding only the page load itself
+
+        Cached pages return at once; a page load waits for a free slot when many
+        searches run at once (see _limit_scrape). The caller falls back to the
+        snippet on TimeoutError.
+        """
+        try:
+            return await self.scraper.scrape_medical_content(url, limit=self._limit_scrape)
+        except asyncio.TimeoutError:
+            logger.warning(f"Scrape timed out after {SCRAPE_TIMEOUT}s, using snippet: {url}")
+            raise
+
+    async def _limit_scrape(self, scrape: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run a page load once a slot is free, timing out SCRAPE_TIMEOUT seconds later
+
+        Applied by the scraper inside its cached/coalesced computation, so a timeout
+        cancels the page load itself and the slot is held exactly as long as it runs.
+        """
+        async with self._scrape_semaphore:
+            return await asyncio.wait_for(scrape(), timeout=SCRAPE_TIMEOUT)
+
     async def research_condition(
         self,
         condition_name: str,
@@ -119,8 +191,20 @@ class FallbackResearchService:
         Returns:
             Structured research data (compatible with ParallelService format)
         """
+        return await self._research_cache.get_or_compute(
+            condition_cache_key(condition_name, symptom_context),
+            lambda: self._research_condition_uncached(condition_name, symptom_context),
+            cacheable=is_cacheable_research,
+        )
+
+    async def _research_condition_uncached(
+        self,
+        condition_name: str,
+        symptom_context: Optional[str],
+    ) -> Dict[str, Any]:
+        """Research one condition without consulting the cache"""
         try:
-            query = f"{condition_name} symptoms causes treatment diagnosis"
+            query = CONDITION_QUERY_TEMPLATE.format(name=condition_name)
             if symptom_context:
                 query += f" {symptom_context[:100]}"
 
@@ -137,12 +221,7 @@ class FallbackResearchService:
             # Structure research findings (basic extraction)
             research = {
                 "condition": condition_name,
-                "overview": self._extract_overview(results),
-                "symptoms": self._extract_symptoms(results),
-                "causes": self._extract_causes(results),
-                "risk_factors": self._extract_risk_factors(results),
-                "diagnosis": self._extract_diagnosis(results),
-                "treatment": self._extract_treatment(results),
+                **self.extract_all(results),
                 "sources": [r.get("citation") for r in results if r.get("citation")],
             }
 
@@ -153,68 +232,13 @@ class FallbackResearchService:
             logger.error(f"Fallback condition research failed: {e}")
             return {"condition": condition_name, "error": str(e)}
 
-    def _extract_overview(self, results: List[Dict[str, Any]]) -> str:
-        """Extract condition overview from search results"""
-        for result in results:
-            content = result.get("content", "")
-            if content and len(content) > 100:
-                return content[:500]
-        return results[0].get("content", "")[:500] if results else ""
-
-    def _extract_symptoms(self, results: List[Dict[str, Any]]) -> List[str]:
-        """Extract symptom list from search results"""
-        symptoms = []
-        for result in results:
-            content = result.get("content", "")
-            if "symptom" in content.lower():
-                # Simple extraction - split by periods
-                lines = content.split(".")
-                symptoms.extend([l.strip() for l in lines if "symptom" in l.lower()])
-        return symptoms[:10]
-
-    def _extract_causes(self, results: List[Dict[str, Any]]) -> List[str]:
-        """Extract causes from search results"""
-        causes = []
-        for result in results:
-            content = result.get("content", "")
-            if "cause" in content.lower():
-                lines = content.split(".")
-                causes.extend([l.strip() for l in lines if "cause" in l.lower()])
-        return causes[:5]
-
-    def _extract_risk_factors(self, results: List[Dict[str, Any]]) -> List[str]:
-        """Extract risk factors from search results"""
-        factors = []
-        for result in results:
-            content = result.get("content", "")
-            if "risk factor" in content.lower():
-                lines = content.split(".")
-                factors.extend([l.strip() for l in lines if "risk" in l.lower()])
-        return factors[:5]
-
-    def _extract_diagnosis(self, results: List[Dict[str, Any]]) -> str:
-        """Extract diagnosis information"""
-        for result in results:
-            content = result.get("content", "")
-            if "diagnos" in content.lower():
-                # Find the sentence containing "diagnosis"
-                sentences = content.split(".")
-                for sentence in sentences:
-                    if "diagnos" in sentence.lower():
-                        return sentence.strip()[:300]
-        return ""
-
-    def _extract_treatment(self, results: List[Dict[str, Any]]) -> str:
-        """Extract treatment information"""
-        for result in results:
-            content = result.get("content", "")
-            if "treatment" in content.lower():
-                # Find the sentence containing "treatment"
-                sentences = content.split(".")
-                for sentence in sentences:
-                    if "treatment" in sentence.lower():
-                        return sentence.strip()[:300]
-        return ""
+    def _overview_excerpt(self, content: str, found: Dict[str, List[str]]) -> Optional[str]:
+        """Overview from the first result with substantial scraped content"""
+        return content[:500] if len(content) > 100 else None
+
+    def _field_excerpt(self, content: str, sentences: List[str]) -> str:
+        """Diagnosis/treatment: first sentence mentioning them"""
+        return sentences[0][:300]
 
     async def find_clinics(
         self,
@@ -2,12 +2,25 @@
 GeoIP service for location lookup
 Uses local database for simplicity (no external API calls)
 """
+import asyncio
 import json
+import threading
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from pathlib import Path
 from loguru import logger
 from config import settings
 
+# Optional orjson - parses the database several times faster than the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Distinct IPs remembered by the lookup cache
+LOOKUP_CACHE_SIZE = 10_000
+
 
 class GeoIPService:
     """Local GeoIP lookup service"""
@@ -16,6 +29,9 @@ class GeoIPService:
         """Initialize with local GeoIP database"""
         self.db_path = settings.geoip_db_path
         self.db = self._load_database()
+        self._prefix_index = self._build_prefix_index(self.db)
+        # Lookups are deterministic per IP - repeat visitors skip the prefix lookups
+        self._lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup_uncached)
         logger.info("GeoIP service initialized")
 
     def _load_database(self) -> Dict[str, Any]:
@@ -25,15 +41,34 @@ class GeoIPService:
                 logger.warning(f"GeoIP database not found at {self.db_path}, using fallback")
                 return self._get_fallback_database()
 
-            with open(self.db_path, "r") as f:
-                db = json.load(f)
-                logger.info(f"Loaded GeoIP database with {len(db)} entries")
-                return db
+            # One read of the raw bytes - no text decoding pass before parsing
+            raw = self.db_path.read_bytes()
+            db = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+            logger.info(f"Loaded GeoIP database with {len(db)} entries")
+            return db
 
         except Exception as e:
             logger.error(f"Failed to load GeoIP database: {e}")
             return self._get_fallback_database()
 
+    @staticmethod
+    def _build_prefix_index(db: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Index the database by dotted octet prefix
+
+        Partial keys ("192.168") are network prefixes and map as-is; a full IPv4
+        key also stands in for its /24 (first entry wins).
+        """
+        index: Dict[str, Any] = {}
+        for db_ip, location in db.items():
+            parts = db_ip.split(".")
+            if len(parts) == 4:
+                index.setdefault(".".join(parts[:3]), location)
+        for db_ip, location in db.items():
+            if 1 < len(db_ip.split(".")) < 4:
+                index[db_ip] = location  # Explicit network prefixes take precedence
+        return index
+
     def _get_fallback_database(self) -> Dict[str, Any]:
         """Fallback database for common IP ranges"""
         return {
@@ -55,15 +90,20 @@ class GeoIPService:
         Returns:
             Dictionary with city, country, lat, lon
         """
+        return self._lookup(ip_address)
+
+    def _lookup_uncached(self, ip_address: str) -> Dict[str, Any]:
+        """Resolve an IP against the database (cached per IP by get_location)"""
         try:
             # Try exact match first
             if ip_address in self.db:
                 return self.db[ip_address]
 
-            # Try IP range matching (simplified)
-            ip_prefix = ".".join(ip_address.split(".")[:3])
-            for db_ip, location in self.db.items():
-                if db_ip.startswith(ip_prefix):
+            # Longest matching octet prefix (/24, then /16) - two dict lookups
+            octets = ip_address.split(".")[:3]
+            for length in range(len(octets), 1, -1):
+                location = self._prefix_index.get(".".join(octets[:length]))
+                if location is not None:
                     logger.debug(f"Found location for IP {ip_address}: {location['city']}")
                     return location
 
@@ -106,5 +146,21 @@ class GeoIPService:
         return self.get_location(ip)
 
 
-# Global instance
-geoip_service = GeoIPService()
+_geoip_service: Optional[GeoIPService] = None
+_geoip_service_lock = threading.Lock()
+
+
+def get_geoip_service() -> GeoIPService:
+    """Shared GeoIPService - the database is loaded on first use (once, even under concurrent callers)"""
+    global _geoip_service
+
+    if _geoip_service is None:
+        with _geoip_service_lock:
+            if _geoip_service is None:
+                _geoip_service = GeoIPService()
+    return _geoip_service
+
+
+async def load_geoip_service() -> GeoIPService:
+    """Load the shared GeoIPService in a worker thread - the file read/parse never blocks the loop"""
+    return await asyncio.to_thread(get_geoip_service)
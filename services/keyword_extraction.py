@@ -0,0 +1,50 @@
+"""
+Keyword/sentence extraction shared by the research services
+"""
+import re
+from typing import Dict, List
+
+# One case-insensitive scan finds every research keyword. The lookahead makes matches
+# zero-width, so overlapping keywords ("diagnosymptom") are all reported like substring
+# checks would; "risk factor" is tried before plain "risk".
+_KEYWORD_RE = re.compile(
+    r"(?=(?P<symptom>symptom)|(?P<cause>cause)|(?P<risk_factor>risk factor)|(?P<risk>risk)"
+    r"|(?P<diagnos>diagnos)|(?P<treatment>treatment)|(?P<overview>overview))",
+    re.IGNORECASE,
+)
+
+
+def keyword_sentences(content: str) -> Dict[str, List[str]]:
+    """
+    Map each research keyword found in content to the sentences containing it
+
+    Sentences are the "."-delimited pieces of content, stripped, in order and
+    listed once per keyword. A "risk factor" mention also counts as "risk".
+
+    Args:
+        content: Text to scan (not lower-cased - matching ignores case)
+
+    Returns:
+        Dict of keyword ("symptom", "cause", "risk_factor", "risk", "diagnos",
+        "treatment", "overview") to sentences; keywords not found are absent
+    """
+    found: Dict[str, List[str]] = {}
+    last_sentence_start: Dict[str, int] = {}
+
+    for match in _KEYWORD_RE.finditer(content):
+        position = match.start()
+        start = content.rfind(".", 0, position) + 1
+        keywords = ("risk_factor", "risk") if match.lastgroup == "risk_factor" else (match.lastgroup,)
+
+        sentence = None
+        for keyword in keywords:
+            if last_sentence_start.get(keyword) == start:
+                continue  # Same sentence already listed for this keyword
+            last_sentence_start[keyword] = start
+            if sentence is None:
+                # Only sliced for a new sentence, and once per match even when it counts twice
+                end = content.find(".", position)
+                sentence = content[start:end if end != -1 else None].strip()
+            found.setdefault(keyword, []).append(sentence)
+
+    return found
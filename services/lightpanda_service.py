@@ -1,9 +1,71 @@
 """
 Lightpanda.io web scraping service for extracting medical content
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable
+import importlib.util
+import json
+import re
 import httpx
 from loguru import logger
+from .research_cache import ResearchCache, canonical_url
+
+# Optional orjson - decodes scrape responses (often hundreds of KB) faster than the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+LIGHTPANDA_API_URL = "https://api.lightpanda.io/v1"
+
+# Common navigation/footer text on medical sites
+NOISE_PATTERNS = [
+    "Cookie Policy",
+    "Privacy Policy",
+    "Terms of Service",
+    "Subscribe to our newsletter",
+    "Share on Facebook",
+    "Share on Twitter",
+]
+
+# Larger scrape responses are abandoned mid-download instead of buffered and parsed
+# (the caller falls back to the search snippet)
+MAX_SCRAPE_RESPONSE_BYTES = 2 * 1024 * 1024
+
+# Scraped pages remembered in-process (pages surface again across different queries)
+SCRAPE_CACHE_SIZE = 1024
+SCRAPE_CACHE_TTL = 1800  # seconds
+
+# One pass over the content instead of one str.replace scan per pattern
+_NOISE_RE = re.compile("|".join(re.escape(pattern) for pattern in NOISE_PATTERNS))
+
+# HTTP/2 multiplexes concurrent scrapes over one connection (h2 ships with httpx[http2];
+# without it the pool falls back to HTTP/1.1 keep-alive)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One keep-alive pool for the whole process - service instances come and go with the
+# research-service factory, the TCP/TLS connections to the API shouldn't
+# (created without awaiting anything, so concurrent first calls can't race)
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Process-wide HTTP client for the Lightpanda API (created on first use)"""
+    global _shared_client
+
+    if _shared_client is None:
+        _shared_client = httpx.AsyncClient(
+            # One retry, on connection errors only (e.g. a transient DNS failure) - more would
+            # just stretch tail latency
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60),
+                retries=1,
+            ),
+            headers={"Content-Type": "application/json"},
+            timeout=30.0,
+        )
+    return _shared_client
 
 
 class LightpandaService:
@@ -17,16 +79,20 @@ class LightpandaService:
             api_key: Lightpanda.io API key (optional if self-hosted)
         """
         self.api_key = api_key
-        self.base_url = "https://api.lightpanda.io/v1"
-        self.client = httpx.AsyncClient(
-            headers={
-                "Authorization": f"Bearer {self.api_key}" if self.api_key else "",
-                "Content-Type": "application/json",
-            },
-            timeout=30.0,
-        )
+        self.base_url = LIGHTPANDA_API_URL
+        # Auth goes on each request - the pooled client is shared by every instance
+        self._auth_headers = {"Authorization": f"Bearer {self.api_key}" if self.api_key else ""}
+        self._scrape_cache = ResearchCache(ttl=SCRAPE_CACHE_TTL, maxsize=SCRAPE_CACHE_SIZE)
         logger.info("Lightpanda service initialized")
 
+    async def warmup(self):
+        """Open a pooled connection to the API ahead of the first scrape (DNS + TCP + TLS)"""
+        try:
+            await _get_client().head(self.base_url, headers=self._auth_headers, timeout=5.0)
+            logger.debug("Lightpanda connection warmed up")
+        except Exception as e:
+            logger.debug(f"Lightpanda warmup failed: {e}")
+
     async def scrape_url(
         self,
         url: str,
@@ -56,13 +122,27 @@ class LightpandaService:
                 },
             }
 
-            response = await self.client.post(
+            # Streamed so an oversized page is cut off as soon as it crosses the limit
+            body = bytearray()
+            async with _get_client().stream(
+                "POST",
                 f"{self.base_url}/scrape",
                 json=payload,
-            )
-            response.raise_for_status()
-
-            data = response.json()
+                headers=self._auth_headers,
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) > MAX_SCRAPE_RESPONSE_BYTES:
+                        logger.warning(f"Lightpanda response for {url} exceeds {MAX_SCRAPE_RESPONSE_BYTES} bytes, skipping")
+                        return {
+                            "url": url,
+                            "content": "",
+                            "success": False,
+                            "error": "Response too large",
+                        }
+
+            data = orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
 
             result = {
                 "url": url,
@@ -97,16 +177,31 @@ class LightpandaService:
     async def scrape_medical_content(
         self,
         url: str,
+        limit: Optional[Callable[..., Awaitable[Dict[str, Any]]]] = None,
     ) -> Dict[str, Any]:
         """
         Scrape medical content with optimized extraction
 
         Args:
             url: Medical page URL
+            limit: Optional wrapper run around the page load only (not cache hits),
+                e.g. a concurrency slot plus timeout; called with a zero-arg coroutine factory
 
         Returns:
             Extracted medical content
         """
+        def scrape():
+            return self._scrape_medical_content_uncached(url)
+
+        # Concurrent scrapes of one page share a single API call; failures aren't kept
+        return await self._scrape_cache.get_or_compute(
+            canonical_url(url),
+            (lambda: limit(scrape)) if limit else scrape,
+            cacheable=lambda result: result.get("success"),
+        )
+
+    async def _scrape_medical_content_uncached(self, url: str) -> Dict[str, Any]:
+        """Scrape and clean one page without consulting the cache"""
         # Use markdown mode for better structured content extraction
         result = await self.scrape_url(url, extract_mode="markdown")
 
@@ -130,21 +225,12 @@ class LightpandaService:
         Returns:
             Cleaned content
         """
-        # Remove common navigation/footer text
-        noise_patterns = [
-            "Cookie Policy",
-            "Privacy Policy",
-            "Terms of Service",
-            "Subscribe to our newsletter",
-            "Share on Facebook",
-            "Share on Twitter",
-        ]
-
-        for pattern in noise_patterns:
-            content = content.replace(pattern, "")
-
-        return content.strip()
+        return _NOISE_RE.sub("", content).strip()
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close the shared HTTP client (process-wide - only call on shutdown)"""
+        global _shared_client
+
+        if _shared_client is not None:
+            client, _shared_client = _shared_client, None
+            await client.aclose()
@@ -1,20 +1,45 @@
 """
 Parallel.ai MCP integration for medical research and clinic discovery
 """
+import asyncio
+import importlib.util
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
+import httpx
 from loguru import logger
 from config import settings
-from models.schemas import ClinicResult
-
-try:
-    from parallel import Parallel
-    PARALLEL_AVAILABLE = True
-except ImportError:
-    PARALLEL_AVAILABLE = False
+from models.schemas import CLINICS_ADAPTER, ClinicResult
+from ._research_extractor import ResearchExtractorMixin
+from .research_cache import ResearchCache, condition_cache_key, is_cacheable_research, search_cache_key
+
+# The SDK itself is imported when a ParallelService is first built - fallback-research
+# configs never pay for it
+PARALLEL_AVAILABLE = importlib.util.find_spec("parallel") is not None
+if not PARALLEL_AVAILABLE:
     logger.warning("Parallel SDK not installed - run: pip install parallel-ai-sdk")
 
+# HTTP/2 multiplexes concurrent searches over one TLS connection (h2 ships with
+# httpx[http2]; without it the pool falls back to HTTP/1.1 keep-alive)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool for the Parallel.ai API - sized for bursts of concurrent searches
+PARALLEL_POOL_LIMITS = httpx.Limits(
+    max_connections=1000,
+    max_keepalive_connections=100,
+    keepalive_expiry=30.0,
+)
+
+# Condition research queries, formatted with the condition name
+CONDITION_QUERY_TEMPLATE = "{name} symptoms causes treatment diagnosis"
+CONDITION_SUBQUERY_TEMPLATES = (
+    "{name} symptoms",
+    "{name} causes",
+    "{name} treatment diagnosis",
+    "{name} risk factors",
+)
 
-class ParallelService:
+
+class ParallelService(ResearchExtractorMixin):
     """Parallel.ai research and search service"""
 
     def __init__(self):
@@ -26,12 +51,29 @@ class ParallelService:
             self.client = None
         else:
             try:
-                self.client = Parallel(api_key=self.api_key)
+                from parallel import AsyncParallel, DefaultAsyncHttpxClient
+
+                # Async SDK client on a tuned keep-alive pool - searches run on the event
+                # loop instead of one worker thread (and connection) each
+                self.client = AsyncParallel(
+                    api_key=self.api_key,
+                    http_client=DefaultAsyncHttpxClient(
+                        transport=httpx.AsyncHTTPTransport(
+                            http2=HTTP2_AVAILABLE,
+                            limits=PARALLEL_POOL_LIMITS,
+                            retries=2,
+                        ),
+                    ),
+                )
                 logger.info("Parallel.ai service initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Parallel client: {e}")
                 self.client = None
 
+        self._search_semaphore = asyncio.Semaphore(settings.parallel_max_concurrency)
+        self._search_cache = ResearchCache(ttl=settings.research_cache_ttl)
+        self._research_cache = ResearchCache(ttl=settings.research_cache_ttl)
+
     async def search_medical(
         self,
         query: str,
@@ -53,29 +95,29 @@ class ParallelService:
             logger.warning("Parallel.ai client not available - returning empty results")
             return []
 
+        return await self._search_cache.get_or_compute(
+            search_cache_key(query, max_results),
+            lambda: self._search_medical_uncached(query, max_results),
+        )
+
+    async def _search_medical_uncached(
+        self,
+        query: str,
+        max_results: int,
+        search_queries: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Run one Parallel.ai search, optionally fanned out over sub-queries (empty list on error)"""
         try:
             # Use Parallel SDK's beta.search API
-            response = self.client.beta.search(
-                mode="one-shot",
+            search_kwargs = {"search_queries": search_queries} if search_queries else {}
+            response = await self._search(
                 max_results=max_results,
-                objective=query
+                objective=query,
+                **search_kwargs,
             )
 
             # Convert Parallel response format to our internal format
-            results = []
-            for item in response.results:
-                # Join excerpts into content
-                content = "\n\n".join(item.excerpts) if item.excerpts else ""
-
-                result = {
-                    "title": item.title,
-                    "url": item.url,
-                    "citation": item.url,
-                    "content": content,
-                    "snippet": content[:500] if content else "",
-                    "publish_date": getattr(item, 'publish_date', None),
-                }
-                results.append(result)
+            results = [self._to_result(item) for item in response.results]
 
             logger.info(f"Found {len(results)} medical search results for: {query}")
             return results
@@ -84,6 +126,11 @@ class ParallelService:
             logger.error(f"Parallel.ai medical search failed: {e}")
             return []
 
+    async def _search(self, **search_kwargs: Any) -> Any:
+        """One Parallel.ai beta.search call, bounded by PARALLEL_MAX_CONCURRENCY"""
+        async with self._search_semaphore:
+            return await self.client.beta.search(mode="one-shot", **search_kwargs)
+
     async def find_clinics(
         self,
         location: Dict[str, float],
@@ -111,34 +158,31 @@ class ParallelService:
             # Use Parallel search to find clinics
             query = f"{specialty or 'medical'} clinic near {location['lat']},{location['lon']} within {max_distance_km}km rating above {min_rating}"
 
-            response = self.client.beta.search(
-                mode="one-shot",
+            response = await self._search(
                 max_results=settings.max_clinics,
-                objective=query
+                objective=query,
             )
 
-            # Parse results into ClinicResult format
-            clinics = []
+            # Parse results into ClinicResult format - validated as one list
+            clinic_data = []
             for item in response.results:
-                try:
-                    # Extract clinic info from search results
-                    clinic = ClinicResult(
-                        name=item.title,
-                        doctor_name="Dr. Staff",  # Default
-                        specialty=specialty or "General Medicine",
-                        rating=min_rating,  # Default
-                        review_count=0,
-                        phone="N/A",
-                        address=item.url,  # Use URL as fallback
-                        distance_km=0.0,
-                        accepts_new_patients=True,
-                        website=item.url,
-                        next_available=None,
-                    )
-                    clinics.append(clinic)
-                except Exception as e:
-                    logger.warning(f"Failed to parse clinic data: {e}")
+                if not (item.title and item.url):
+                    logger.warning(f"Skipping incomplete clinic result: {item.url or item.title}")
                     continue
+                clinic_data.append({
+                    "name": item.title,
+                    "doctor_name": "Dr. Staff",  # Default
+                    "specialty": specialty or "General Medicine",
+                    "rating": min_rating,  # Default
+                    "review_count": 0,
+                    "phone": "N/A",
+                    "address": item.url,  # Use URL as fallback
+                    "distance_km": 0.0,
+                    "accepts_new_patients": True,
+                    "website": item.url,
+                    "next_available": None,
+                })
+            clinics = CLINICS_ADAPTER.validate_python(clinic_data)
 
             logger.info(f"Found {len(clinics)} clinics near location")
             return clinics
@@ -162,29 +206,32 @@ class ParallelService:
         Returns:
             Structured research data
         """
-        try:
-            query = f"{condition_name} symptoms causes treatment diagnosis"
-            if symptom_context:
-                query += f" patient symptoms: {symptom_context[:100]}"
+        return await self._research_cache.get_or_compute(
+            condition_cache_key(condition_name, symptom_context),
+            lambda: self._research_condition_uncached(condition_name, symptom_context),
+            cacheable=is_cacheable_research,
+        )
 
-            # Search medical literature
-            results = await self.search_medical(
-                query=query,
+    async def _research_condition_uncached(
+        self,
+        condition_name: str,
+        symptom_context: Optional[str],
+    ) -> Dict[str, Any]:
+        """Research one condition without consulting the cache"""
+        if not self.client:
+            logger.warning("Parallel.ai client not available - returning empty research")
+            return self._structure_research(condition_name, [])
+
+        try:
+            # Search medical literature - Parallel runs the aspect sub-queries server-side,
+            # so covering symptoms/causes/treatment/risk factors costs one round-trip
+            results = await self._search_medical_uncached(
+                self._condition_query(condition_name, symptom_context),
                 max_results=5,
+                search_queries=self._condition_subqueries(condition_name),
             )
 
-            # Structure research findings
-            research = {
-                "condition": condition_name,
-                "overview": self._extract_overview(results),
-                "symptoms": self._extract_symptoms(results),
-                "causes": self._extract_causes(results),
-                "risk_factors": self._extract_risk_factors(results),
-                "diagnosis": self._extract_diagnosis(results),
-                "treatment": self._extract_treatment(results),
-                "sources": [r.get("citation") for r in results if r.get("citation")],
-            }
-
+            research = self._structure_research(condition_name, results)
             logger.info(f"Completed research on condition: {condition_name}")
             return research
 
@@ -192,95 +239,139 @@ class ParallelService:
             logger.error(f"Condition research failed: {e}")
             return {"condition": condition_name, "error": str(e)}
 
+    async def research_conditions(
+        self,
+        condition_names: List[str],
+        symptom_context: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Research several conditions concurrently
+
+        Each condition gets its own search (with its aspect sub-queries). A single
+        multi-query search can't be used: its results come back merged, with nothing
+        saying which query returned them. Cached conditions are served from the cache.
+
+        Args:
+            condition_names: Conditions to research
+            symptom_context: Patient symptoms for context
+
+        Returns:
+            Mapping of condition name to structured research data
+        """
+        research = await self._research_each(condition_names, symptom_context)
+        logger.info(f"Completed research on {len(condition_names)} conditions")
+        return research
+
+    async def _research_each(
+        self,
+        condition_names: List[str],
+        symptom_context: Optional[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Research conditions concurrently - one failing (e.g. rate limited) doesn't sink the rest"""
+        researched = await asyncio.gather(
+            *(self.research_condition(name, symptom_context) for name in condition_names),
+            return_exceptions=True,
+        )
+        research = {}
+        for name, result in zip(condition_names, researched):
+            if isinstance(result, Exception):
+                logger.error(f"Condition research failed for {name}: {result}")
+                result = {"condition": name, "error": str(result)}
+            research[name] = result
+        return research
+
+    @staticmethod
+    def _condition_query(condition_name: str, symptom_context: Optional[str]) -> str:
+        """Search query for researching one condition"""
+        query = CONDITION_QUERY_TEMPLATE.format(name=condition_name)
+        if symptom_context:
+            query += f" patient symptoms: {symptom_context[:100]}"
+        return query
+
+    @staticmethod
+    def _condition_subqueries(condition_name: str) -> List[str]:
+        """One search query per aspect of a condition"""
+        return [template.format(name=condition_name) for template in CONDITION_SUBQUERY_TEMPLATES]
+
+    @staticmethod
+    def _to_result(item: Any) -> Dict[str, Any]:
+        """Convert a Parallel search result to our internal format"""
+        # Join excerpts into content
+        content = "\n\n".join(item.excerpts) if item.excerpts else ""
+        return {
+            "title": item.title,
+            "url": item.url,
+            "citation": item.url,
+            "content": content,
+            "snippet": content[:500] if content else "",
+            "publish_date": getattr(item, 'publish_date', None),
+        }
+
+    def _structure_research(self, condition_name: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Structure research findings for one condition"""
+        return {
+            "condition": condition_name,
+            **self.extract_all(results),
+            "sources": [r.get("citation") for r in results if r.get("citation")],
+        }
+
     def _extract_doctor_name(self, place: Dict[str, Any]) -> str:
         """Extract doctor name from place data"""
         # Try various fields where doctor name might be stored
-        return (
-            place.get("doctor_name") or
-            place.get("provider_name") or
-            place.get("name", "").split("-")[0].strip() or
-            "Dr. Smith"  # Fallback
-        )
+        name = place.get("doctor_name") or place.get("provider_name")
+        if name:
+            return name
 
-    def _extract_overview(self, results: List[Dict[str, Any]]) -> str:
-        """Extract condition overview from search results"""
-        for result in results:
-            if "overview" in result.get("content", "").lower():
-                return result.get("content", "")[:500]
-        return results[0].get("content", "")[:500] if results else ""
-
-    def _extract_symptoms(self, results: List[Dict[str, Any]]) -> List[str]:
-        """Extract symptom list from search results"""
-        symptoms = []
-        for result in results:
-            content = result.get("content", "")
-            if "symptom" in content.lower():
-                # Simple extraction - could be enhanced with NLP
-                lines = content.split(".")
-                symptoms.extend([l.strip() for l in lines if "symptom" in l.lower()])
-        return symptoms[:10]  # Top 10 symptoms
-
-    def _extract_causes(self, results: List[Dict[str, Any]]) -> List[str]:
-        """Extract causes from search results"""
-        causes = []
-        for result in results:
-            content = result.get("content", "")
-            if "cause" in content.lower():
-                lines = content.split(".")
-                causes.extend([l.strip() for l in lines if "cause" in l.lower()])
-        return causes[:5]
-
-    def _extract_risk_factors(self, results: List[Dict[str, Any]]) -> List[str]:
-        """Extract risk factors from search results"""
-        factors = []
-        for result in results:
-            content = result.get("content", "")
-            if "risk factor" in content.lower():
-                lines = content.split(".")
-                factors.extend([l.strip() for l in lines if "risk" in l.lower()])
-        return factors[:5]
-
-    def _extract_diagnosis(self, results: List[Dict[str, Any]]) -> str:
-        """Extract diagnosis information"""
-        for result in results:
-            content = result.get("content", "")
-            if "diagnos" in content.lower():
-                return content[:300]
-        return ""
-
-    def _extract_treatment(self, results: List[Dict[str, Any]]) -> str:
-        """Extract treatment information"""
-        for result in results:
-            content = result.get("content", "")
-            if "treatment" in content.lower():
-                return content[:300]
-        return ""
+        # Else the part of the place name before the first "-"
+        head, _, _ = (place.get("name") or "").partition("-")
+        return head.strip() or "Dr. Smith"  # Fallback
 
     async def close(self):
         """Close client connection"""
-        # Parallel SDK handles cleanup automatically
-        pass
+        if self.client:
+            await self.client.close()
+
+    async def __aenter__(self) -> "ParallelService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
 
-# Global instance
-parallel_service = ParallelService()
+@lru_cache(maxsize=1)
+def get_parallel_service() -> ParallelService:
+    """Shared ParallelService, created on first use"""
+    return ParallelService()
 
 
-def get_research_service():
+@lru_cache(maxsize=2)
+def _get_fallback_service(lightpanda_api_key: Optional[str], browser: str, redis_service=None):
+    """Shared FallbackResearchService per configuration, created on first use"""
+    from .fallback_research_service import FallbackResearchService
+    return FallbackResearchService(
+        lightpanda_api_key=lightpanda_api_key,
+        browser=browser,
+        redis_service=redis_service,
+    )
+
+
+def get_research_service(redis_service=None):
     """
     Factory function to get the appropriate research service based on configuration
 
+    The service is shared across calls, so its connection pools and caches
+    outlive any one request.
+
+    Args:
+        redis_service: Shared Redis service for the fallback's page cache (optional)
+
     Returns:
         ParallelService or FallbackResearchService based on USE_FALLBACK_RESEARCH setting
     """
     if settings.use_fallback_research:
-        from .fallback_research_service import FallbackResearchService
         browser = settings.fallback_browser
         logger.info(f"Using fallback research service (DuckDuckGo + {browser.capitalize()})")
-        return FallbackResearchService(
-            lightpanda_api_key=settings.lightpanda_api_key,
-            browser=browser
-        )
+        return _get_fallback_service(settings.lightpanda_api_key, browser, redis_service)
     else:
         logger.info("Using Parallel.ai research service")
-        return parallel_service
+        return get_parallel_service()
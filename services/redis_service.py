@@ -4,22 +4,71 @@ Integrates with Redis MCP Server + RedisVL
 """
 import json
 import hashlib
-from typing import Optional, Dict, Any, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple, Union
 from datetime import timedelta
 import redis
 from loguru import logger
 from config import settings
 
+# Optional orjson for faster payload (de)serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Optional RedisVL for semantic caching
 try:
     from redisvl.index import SearchIndex
     from redisvl.query import VectorQuery
     from redisvl.query.filter import Tag
+    from redisvl.extensions.llmcache import SemanticCache
+    from redisvl.utils.vectorize import HFTextVectorizer
     REDISVL_AVAILABLE = True
 except ImportError:
     REDISVL_AVAILABLE = False
     logger.warning("RedisVL not available - semantic caching disabled")
 
+# Vector searches run at once by search_similar_symptoms_batch
+SIMILARITY_SEARCH_WORKERS = 8
+
+# Named semantic caches are shared process-wide - the embedding model is expensive to load
+_semantic_caches: Dict[str, Any] = {}
+_vectorizer = None
+_semantic_cache_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _text_cache_key(text: str) -> str:
+    """Digest of normalized text (memoized - symptom texts repeat within a session)"""
+    return hashlib.sha256(text.lower().strip().encode()).hexdigest()[:16]
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize pydantic models and datetimes nested in payloads"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def dumps(obj: Any) -> Any:
+    """Serialize a payload for Redis (orjson bytes when available, else stdlib str)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_json_default)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize a payload read from Redis"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class RedisService:
     """Redis-based memory and caching service"""
@@ -74,11 +123,37 @@ class RedisService:
         """Retrieve session data from Redis"""
         try:
             data = self.client.get(f"session:{session_id}")
-            return json.loads(data) if data else None
+            return loads(data) if data else None
         except Exception as e:
             logger.error(f"Failed to get session {session_id}: {e}")
             return None
 
+    def mget_sessions(self, session_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Retrieve several sessions in one round-trip (MGET)"""
+        if not session_ids:
+            return {}
+        try:
+            values = self.client.mget([f"session:{session_id}" for session_id in session_ids])
+            return {
+                session_id: loads(data) if data else None
+                for session_id, data in zip(session_ids, values)
+            }
+        except Exception as e:
+            logger.error(f"Failed to get sessions: {e}")
+            return {session_id: None for session_id in session_ids}
+
+    def get_session_with_result(
+        self,
+        session_id: str,
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Retrieve session data and its final result (if stored yet) in one round-trip"""
+        try:
+            data, result = self.client.mget([f"session:{session_id}", f"session:{session_id}:result"])
+            return (loads(data) if data else None, loads(result) if result else None)
+        except Exception as e:
+            logger.error(f"Failed to get session {session_id}: {e}")
+            return None, None
+
     def set_session_data(
         self,
         session_id: str,
@@ -89,16 +164,10 @@ class RedisService:
         try:
             ttl = ttl or settings.session_timeout
 
-            # Custom JSON encoder for datetime objects
-            def json_encoder(obj):
-                if hasattr(obj, 'isoformat'):
-                    return obj.isoformat()
-                raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
             self.client.setex(
                 f"session:{session_id}",
                 ttl,
-                json.dumps(data, default=json_encoder)
+                dumps(data)
             )
             logger.debug(f"Stored session {session_id} with TTL {ttl}s")
             return True
@@ -106,6 +175,43 @@ class RedisService:
             logger.error(f"Failed to set session {session_id}: {e}")
             return False
 
+    def get_session_result(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve the final analysis result of a session"""
+        try:
+            data = self.client.get(f"session:{session_id}:result")
+            return loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Failed to get result for session {session_id}: {e}")
+            return None
+
+    def set_session_result(
+        self,
+        session_id: str,
+        result: Union[str, Dict[str, Any]],
+        ttl: Optional[int] = None
+    ) -> bool:
+        """
+        Store the final analysis result apart from the session status
+
+        Args:
+            session_id: Session identifier
+            result: Pre-serialized JSON (stored as-is) or a dict
+            ttl: Expiry in seconds (defaults to the session timeout)
+
+        Returns:
+            True if stored
+        """
+        try:
+            self.client.setex(
+                f"session:{session_id}:result",
+                ttl or settings.session_timeout,
+                result if isinstance(result, (str, bytes)) else dumps(result)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to set result for session {session_id}: {e}")
+            return False
+
     def get_agent_memory(self, agent_id: str, key: str) -> Optional[str]:
         """Retrieve agent-specific memory"""
         try:
@@ -114,17 +220,167 @@ class RedisService:
             logger.error(f"Failed to get agent memory: {e}")
             return None
 
-    def set_agent_memory(self, agent_id: str, key: str, value: str, ttl: Optional[int] = None) -> bool:
-        """Store agent-specific memory"""
+    def set_agent_memory(self, agent_id: str, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Store agent-specific memory (non-string values are JSON-serialized)"""
+        return self.mset_agent_memory(agent_id, {key: value}, ttl)
+
+    def mget_agent_memory(self, agent_id: str, keys: List[str]) -> Dict[str, Optional[str]]:
+        """Retrieve several agent memory fields in one round-trip (HMGET)"""
+        if not keys:
+            return {}
         try:
-            self.client.hset(f"agent:{agent_id}:memory", key, value)
+            values = self.client.hmget(f"agent:{agent_id}:memory", keys)
+            return dict(zip(keys, values))
+        except Exception as e:
+            logger.error(f"Failed to get agent memory: {e}")
+            return {key: None for key in keys}
+
+    def mset_agent_memory(
+        self,
+        agent_id: str,
+        mapping: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """Store several agent memory fields, plus the TTL, in one pipelined round-trip"""
+        if not mapping:
+            return True
+        memory_key = f"agent:{agent_id}:memory"
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.hset(memory_key, mapping={
+                key: value if isinstance(value, str) else dumps(value)
+                for key, value in mapping.items()
+            })
             if ttl:
-                self.client.expire(f"agent:{agent_id}:memory", ttl)
+                pipe.expire(memory_key, ttl)
+            pipe.execute()
             return True
         except Exception as e:
             logger.error(f"Failed to set agent memory: {e}")
             return False
 
+    def get_llm_response(self, cache_key: str) -> Optional[str]:
+        """Retrieve a cached LLM completion"""
+        try:
+            return self.client.get(cache_key)
+        except Exception as e:
+            logger.error(f"Failed to get cached LLM response: {e}")
+            return None
+
+    def set_llm_response(self, cache_key: str, content: str, ttl: int) -> bool:
+        """Cache an LLM completion with TTL"""
+        try:
+            self.client.setex(cache_key, ttl, content)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache LLM response: {e}")
+            return False
+
+    def get_scraped_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a cached page scrape"""
+        try:
+            data = self.client.get(f"scrape:{hashlib.sha256(url.encode()).hexdigest()}")
+            return loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Failed to get cached scrape: {e}")
+            return None
+
+    def set_scraped_page(self, url: str, result: Dict[str, Any], ttl: int) -> bool:
+        """Cache a page scrape with TTL"""
+        try:
+            self.client.setex(f"scrape:{hashlib.sha256(url.encode()).hexdigest()}", ttl, dumps(result))
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache scrape: {e}")
+            return False
+
+    def get_analysis_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a cached analysis response"""
+        try:
+            data = self.client.get(f"resp:{cache_key}")
+            return loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Failed to get cached analysis response: {e}")
+            return None
+
+    def set_analysis_response(self, cache_key: str, response: Union[str, Dict[str, Any]], ttl: int) -> bool:
+        """Cache an analysis response (pre-serialized JSON or dict) with TTL"""
+        try:
+            self.client.setex(
+                f"resp:{cache_key}",
+                ttl,
+                response if isinstance(response, (str, bytes)) else dumps(response)
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache analysis response: {e}")
+            return False
+
+    def _get_semantic_cache(self, cache_name: str) -> Optional["SemanticCache"]:
+        """Get (or lazily create) a named RedisVL semantic cache"""
+        global _vectorizer
+
+        if not REDISVL_AVAILABLE:
+            return None
+
+        if cache_name in _semantic_caches:
+            return _semantic_caches[cache_name]
+
+        # Pipelines run concurrently in threads - build the vectorizer and each cache once
+        with _semantic_cache_lock:
+            if cache_name not in _semantic_caches:
+                try:
+                    if _vectorizer is None:
+                        _vectorizer = HFTextVectorizer(model=settings.embedding_model)
+
+                    _semantic_caches[cache_name] = SemanticCache(
+                        name=f"{settings.redisvl_index_name}:{cache_name}",
+                        prefix=cache_name,
+                        ttl=settings.semantic_cache_ttl,
+                        vectorizer=_vectorizer,
+                        redis_client=self.client,
+                    )
+                    logger.info(f"Semantic cache '{cache_name}' initialized")
+                except Exception as e:
+                    logger.warning(f"Semantic cache '{cache_name}' unavailable: {e}")
+                    _semantic_caches[cache_name] = None
+
+        return _semantic_caches[cache_name]
+
+    def semantic_lookup(
+        self,
+        cache_name: str,
+        text: str,
+        similarity_threshold: float,
+    ) -> Optional[str]:
+        """Return the cached response for the most similar text above the threshold"""
+        try:
+            cache = self._get_semantic_cache(cache_name)
+            if not cache:
+                return None
+
+            hits = cache.check(prompt=text, distance_threshold=1 - similarity_threshold)
+            if hits:
+                logger.info(f"Semantic cache hit in '{cache_name}'")
+                return hits[0]["response"]
+            return None
+        except Exception as e:
+            logger.error(f"Semantic cache lookup failed: {e}")
+            return None
+
+    def semantic_store(self, cache_name: str, text: str, response: str) -> bool:
+        """Store a response in a named semantic cache"""
+        try:
+            cache = self._get_semantic_cache(cache_name)
+            if not cache:
+                return False
+
+            cache.store(prompt=text, response=response)
+            return True
+        except Exception as e:
+            logger.error(f"Semantic cache store failed: {e}")
+            return False
+
     def cache_symptom_analysis(
         self,
         symptom_text: str,
@@ -139,14 +395,14 @@ class RedisService:
                 return self.client.setex(
                     f"cache:{cache_key}",
                     3600,  # 1 hour TTL
-                    json.dumps(conditions)
+                    dumps(conditions)
                 )
 
             # Use semantic cache with vector similarity
             doc = {
                 "symptom_text": symptom_text,
                 "embedding": embedding,
-                "conditions": json.dumps(conditions),
+                "conditions": dumps(conditions),
                 "timestamp": int(time.time()),
             }
             cache_key = f"symptom:{self._generate_cache_key(symptom_text)}"
@@ -182,7 +438,7 @@ class RedisService:
                 if similarity_score >= settings.redisvl_similarity_threshold:
                     similar.append({
                         "symptom_text": result.get("symptom_text"),
-                        "conditions": json.loads(result.get("conditions", "[]")),
+                        "conditions": loads(result.get("conditions", "[]")),
                         "similarity": similarity_score,
                     })
             logger.info(f"Found {len(similar)} similar cached symptoms")
@@ -191,9 +447,36 @@ class RedisService:
             logger.error(f"Failed to search similar symptoms: {e}")
             return []
 
+    def search_similar_symptoms_batch(
+        self,
+        queries: List[Tuple[str, List[float]]],
+        top_k: int = 3
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar cached symptoms for several texts at once
+
+        RedisVL 0.3 has no batch query, so the KNN searches run concurrently
+        over the connection pool instead of one after another.
+
+        Args:
+            queries: (symptom_text, embedding) pairs, e.g. rephrasings of one case
+            top_k: Nearest neighbours per query
+
+        Returns:
+            Similar cached symptoms for each query, in query order
+        """
+        if len(queries) <= 1:
+            return [self.search_similar_symptoms(text, embedding, top_k) for text, embedding in queries]
+
+        with ThreadPoolExecutor(max_workers=min(len(queries), SIMILARITY_SEARCH_WORKERS)) as pool:
+            return list(pool.map(
+                lambda query: self.search_similar_symptoms(query[0], query[1], top_k),
+                queries,
+            ))
+
     def _generate_cache_key(self, text: str) -> str:
         """Generate cache key from text"""
-        return hashlib.sha256(text.lower().strip().encode()).hexdigest()[:16]
+        return _text_cache_key(text)
 
     def health_check(self) -> bool:
         """Check Redis connection health"""
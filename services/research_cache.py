@@ -0,0 +1,130 @@
+"""
+In-process LRU + TTL cache for research lookups
+Condition overviews and medical searches are near-static, and the same common
+conditions come up across sessions and agent rounds
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from loguru import logger
+
+# Entries kept per cache (least recently used evicted first)
+RESEARCH_CACHE_SIZE = 512
+
+
+class ResearchCache:
+    """LRU + TTL cache whose concurrent misses on one key share a single lookup"""
+
+    def __init__(self, ttl: float, maxsize: int = RESEARCH_CACHE_SIZE):
+        """
+        Initialize cache
+
+        Args:
+            ttl: Seconds an entry stays valid (0 disables caching)
+            maxsize: Maximum number of entries
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the unexpired value for key, or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value for key, evicting the least recently used entry when full"""
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        Return the cached value for key, computing it on a miss
+
+        Concurrent callers missing on the same key await one shared computation
+        instead of each hitting the network (stampede protection).
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value
+            cacheable: Whether a computed value may be stored (errors/empty results shouldn't be)
+
+        Returns:
+            Cached or freshly computed value
+        """
+        if self.ttl <= 0:
+            return await compute()
+
+        value = self.get(key)
+        if value is not None:
+            logger.debug(f"Research cache hit: {key}")
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+
+            def _store(done: asyncio.Task):
+                self._inflight.pop(key, None)
+                if not done.cancelled() and done.exception() is None and cacheable(done.result()):
+                    self.set(key, done.result())
+
+            task.add_done_callback(_store)
+
+        # Shielded so one cancelled caller doesn't cancel the lookup the others are waiting on
+        return await asyncio.shield(task)
+
+
+def condition_cache_key(condition_name: str, symptom_context: Optional[str]) -> Tuple[str, str]:
+    """Normalized key for researching one condition (context trimmed as in the search query)"""
+    return (
+        " ".join(condition_name.lower().split()),
+        " ".join((symptom_context or "")[:100].lower().split()),
+    )
+
+
+def search_cache_key(query: str, max_results: int) -> Tuple[str, int]:
+    """Normalized key for one search"""
+    return " ".join(query.lower().split()), max_results
+
+
+def is_cacheable_research(research: Dict[str, Any]) -> bool:
+    """Only research backed by actual sources is worth keeping"""
+    return "error" not in research and bool(research.get("sources"))
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a page URL so mirrors of one page compare equal
+
+    Drops the scheme, a leading "www.", host case, trailing slashes, utm_*
+    tracking parameters and the fragment.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    query = urlencode([
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    ])
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, ""))
@@ -3,9 +3,10 @@ Skyflow API integration for data sanitization
 Tokenizes sensitive medical information (PII/PHI) in text
 Uses Skyflow 2.0 SDK API
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 import base64
 import re
+from functools import lru_cache
 from loguru import logger
 from config import settings
 
@@ -21,6 +22,13 @@ except ImportError:
     SKYFLOW_SDK_AVAILABLE = False
     logger.warning("Skyflow SDK not available - using regex fallback only")
 
+# Field-name fragments that mark a field as PII/PHI, matched in one regex pass per key
+SENSITIVE_FIELD_PATTERNS = [
+    "name", "ssn", "dob", "birth", "phone", "email",
+    "address", "insurance", "medical_record", "patient_id",
+]
+_SENSITIVE_FIELD_RE = re.compile("|".join(re.escape(pattern) for pattern in SENSITIVE_FIELD_PATTERNS))
+
 
 class SkyflowService:
     """Skyflow data sanitization service"""
@@ -209,13 +217,12 @@ class SkyflowService:
             logger.warning("Skyflow not initialized, returning unsanitized data")
             return data
 
-        try:
-            # Identify sensitive fields (PII/PHI)
-            sensitive_fields = self._identify_sensitive_fields(data)
-
-            if not sensitive_fields:
-                return data
+        # Identify sensitive fields (PII/PHI) once - reused by the redaction fallback
+        sensitive_fields = frozenset(self._identify_sensitive_fields(data))
+        if not sensitive_fields:
+            return data
 
+        try:
             # Prepare data for insertion with v2 API
             insert_data = [{
                 key: value
@@ -250,7 +257,7 @@ class SkyflowService:
 
         except Exception as e:
             logger.error(f"Skyflow sanitization failed: {e}")
-            return self._redact_sensitive_fields(data)
+            return self._redact_sensitive_fields(data, sensitive_fields)
 
     def detokenize_data(self, tokenized_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -338,19 +345,17 @@ class SkyflowService:
 
     def _identify_sensitive_fields(self, data: Dict[str, Any]) -> List[str]:
         """Identify fields containing PII/PHI"""
-        sensitive_patterns = [
-            "name", "ssn", "dob", "birth", "phone", "email",
-            "address", "insurance", "medical_record", "patient_id",
-        ]
-        return [
-            key for key in data.keys()
-            if any(pattern in key.lower() for pattern in sensitive_patterns)
-        ]
-
-    def _redact_sensitive_fields(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Fallback: Redact sensitive fields if Skyflow fails"""
+        return [key for key in data if _SENSITIVE_FIELD_RE.search(key.lower())]
+
+    def _redact_sensitive_fields(
+        self,
+        data: Dict[str, Any],
+        sensitive: Optional[FrozenSet[str]] = None,
+    ) -> Dict[str, Any]:
+        """Fallback: Redact sensitive fields if Skyflow fails (detected here unless already known)"""
         redacted = data.copy()
-        sensitive = self._identify_sensitive_fields(data)
+        if sensitive is None:
+            sensitive = self._identify_sensitive_fields(data)
         for field in sensitive:
             redacted[field] = "[REDACTED]"
         return redacted
@@ -363,5 +368,14 @@ class SkyflowService:
         return value.startswith("tok_") or len(value) == 32
 
 
-# Global instance
-skyflow_service = SkyflowService()
+@lru_cache(maxsize=1)
+def get_skyflow_service() -> SkyflowService:
+    """Shared SkyflowService, created on first use"""
+    return SkyflowService()
+
+
+def __getattr__(name: str) -> Any:
+    """Keep `from services.skyflow_service import skyflow_service` working, built lazily"""
+    if name == "skyflow_service":
+        return get_skyflow_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
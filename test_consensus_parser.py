@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test streamed forum consensus parsing
+
+The streaming parser must give the same result as parsing the buffered response,
+however the LLM stream happens to be chunked (no API keys needed)
+"""
+import sys
+from agents.forum_coordinator import AdversarialForum, _ConsensusStreamParser
+from models.schemas import AgentResearchResult
+
+
+RESEARCH_RESULTS = [
+    AgentResearchResult(
+        agent_id=f"agent_{i}",
+        agent_type="deep",
+        condition_researched=condition,
+        findings="Findings",
+        confidence=confidence,
+        reasoning="Reasoning",
+        processing_time_ms=0,
+    )
+    for i, (condition, confidence) in enumerate([
+        ("Iron Deficiency Anemia", 0.7),
+        ("Hypothyroidism", 0.5),
+        ("Influenza", 0.3),
+    ])
+]
+
+DEBATE_HISTORY = [{"round": 1, "round_analysis": "Round analysis", "critiques": {}}]
+
+CONSENSUS_RESPONSES = {
+    "Typical response": """Weighing the debate, the evidence favours anemia.
+
+CONSENSUS: Iron Deficiency Anemia, Hypothyroidism
+CONTESTED: Influenza
+ADJUSTMENTS:
+- Iron Deficiency Anemia: 1.2
+- Hypothyroidism: 0.9
+- Influenza: 0.4
+""",
+    "Indented, no trailing newline": (
+        "  CONSENSUS: Hypothyroidism\n"
+        "\tCONTESTED: Iron Deficiency Anemia, Influenza\n"
+        "ADJUSTMENTS:\n"
+        "- Hypothyroidism: 1.1\n"
+        "- Influenza: 0.5"
+    ),
+    "Duplicate adjustment (last wins)": """CONSENSUS: Influenza
+CONTESTED: none
+ADJUSTMENTS:
+- Influenza: 0.8
+- Influenza: 1.5
+""",
+    "No sections": "The forum could not reach a conclusion.",
+}
+
+
+def stream_consensus(forum: AdversarialForum, chunks) -> dict:
+    """Feed chunks to the streaming parser and map the result like _synthesize_consensus"""
+    parser = _ConsensusStreamParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return forum._map_consensus(
+        parser.consensus_conditions or [],
+        parser.contested_conditions or [],
+        parser.adjustments,
+        RESEARCH_RESULTS,
+        DEBATE_HISTORY,
+    )
+
+
+def test_split_at_every_offset():
+    """Test the stream split into two chunks at every offset"""
+
+    # Parsing needs no client or Redis connection
+    forum = AdversarialForum.__new__(AdversarialForum)
+
+    print("Testing consensus stream parsing")
+    print("=" * 60)
+
+    passed = 0
+    failed = 0
+
+    for name, response in CONSENSUS_RESPONSES.items():
+        expected = forum._parse_consensus(response, RESEARCH_RESULTS, DEBATE_HISTORY)
+
+        mismatches = [
+            offset for offset in range(len(response) + 1)
+            if stream_consensus(forum, [response[:offset], response[offset:]]) != expected
+        ]
+        # One character per chunk is the most fragmented stream possible
+        if stream_consensus(forum, list(response)) != expected:
+            mismatches.append("per-character")
+
+        success = not mismatches
+        status = "✓ PASS" if success else "✗ FAIL"
+
+        print(f"\n{status} - {name}")
+        print(f"  Adjustments: {expected['confidence_adjustments']}")
+        if mismatches:
+            print(f"  Mismatched splits: {mismatches[:10]}")
+
+        if success:
+            passed += 1
+        else:
+            failed += 1
+
+    print("\n" + "=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+
+    return failed == 0
+
+
+if __name__ == "__main__":
+    print("Forum Consensus Parser Tests")
+    print("=" * 60)
+    print("Comparing streamed and buffered parsing (no API needed)\n")
+
+    results = [
+        test_split_at_every_offset(),
+    ]
+
+    print("\n" + "=" * 60)
+    if all(results):
+        print("✓ ALL TESTS PASSED")
+        sys.exit(0)
+    else:
+        print("✗ SOME TESTS FAILED")
+        sys.exit(1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the in-process research cache
+
+Tests TTL expiry, LRU eviction, coalescing of concurrent misses and that
+failures aren't cached (no API keys needed)
+"""
+import sys
+import time
+import asyncio
+from services.research_cache import ResearchCache
+
+
+def report(name: str, success: bool, detail: str) -> bool:
+    """Print one test outcome"""
+    print(f"\n{'✓ PASS' if success else '✗ FAIL'} - {name}")
+    print(f"  {detail}")
+    return success
+
+
+def test_ttl():
+    """Test entries expire after the TTL, and a TTL of 0 disables caching"""
+
+    cache = ResearchCache(ttl=0.05)
+    cache.set("anemia", "overview")
+    fresh = cache.get("anemia")
+    time.sleep(0.1)
+    expired = cache.get("anemia")
+
+    disabled = ResearchCache(ttl=0)
+    disabled.set("anemia", "overview")
+
+    success = fresh == "overview" and expired is None and disabled.get("anemia") is None
+    return report(
+        "TTL expiry",
+        success,
+        f"Fresh: {fresh!r}, expired: {expired!r}, TTL 0: {disabled.get('anemia')!r}",
+    )
+
+
+def test_lru_eviction():
+    """Test the least recently used entry is evicted when full"""
+
+    cache = ResearchCache(ttl=60, maxsize=2)
+    cache.set("anemia", 1)
+    cache.set("influenza", 2)
+    cache.get("anemia")  # Now the most recently used
+    cache.set("lupus", 3)
+
+    kept = {key: cache.get(key) for key in ("anemia", "influenza", "lupus")}
+    success = kept == {"anemia": 1, "influenza": None, "lupus": 3}
+    return report("LRU eviction", success, f"Entries after overflow: {kept}")
+
+
+def test_coalescing():
+    """Test concurrent misses on one key share a single computation"""
+
+    cache = ResearchCache(ttl=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"sources": ["u1"]}
+
+    async def run():
+        results = await asyncio.gather(*[cache.get_or_compute("anemia", compute) for _ in range(5)])
+        cached = await cache.get_or_compute("anemia", compute)
+        return results, cached
+
+    results, cached = asyncio.run(run())
+    shared = all(result is results[0] for result in results) and cached is results[0]
+
+    success = len(calls) == 1 and shared
+    return report("Coalescing", success, f"Computations for 6 lookups: {len(calls)}, same result: {shared}")
+
+
+def test_cancelled_caller():
+    """Test a cancelled caller doesn't cancel the computation others wait on"""
+
+    cache = ResearchCache(ttl=60)
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "overview"
+
+    async def run():
+        first = asyncio.ensure_future(cache.get_or_compute("anemia", compute))
+        second = asyncio.ensure_future(cache.get_or_compute("anemia", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    value = asyncio.run(run())
+    success = value == "overview" and cache.get("anemia") == "overview"
+    return report("Cancelled caller", success, f"Other caller got: {value!r}, cached: {cache.get('anemia')!r}")
+
+
+def test_failures_not_cached():
+    """Test errors and uncacheable results are recomputed on the next lookup"""
+
+    cache = ResearchCache(ttl=60)
+    calls = []
+
+    async def failing():
+        calls.append("error")
+        await asyncio.sleep(0.01)
+        raise RuntimeError("search failed")
+
+    async def empty():
+        calls.append("empty")
+        return {"sources": []}
+
+    async def run():
+        errors = await asyncio.gather(
+            *[cache.get_or_compute("anemia", failing) for _ in range(3)],
+            return_exceptions=True,
+        )
+        await cache.get_or_compute("anemia", empty, cacheable=lambda r: bool(r["sources"]))
+        await cache.get_or_compute("anemia", empty, cacheable=lambda r: bool(r["sources"]))
+        return errors
+
+    errors = asyncio.run(run())
+    all_raised = all(isinstance(e, RuntimeError) for e in errors)
+
+    success = all_raised and calls == ["error", "empty", "empty"] and cache.get("anemia") is None
+    return report("Failures not cached", success, f"All waiters raised: {all_raised}, computations: {calls}")
+
+
+if __name__ == "__main__":
+    print("Research Cache Tests")
+    print("=" * 60)
+    print("Testing in-process LRU + TTL cache (no API needed)")
+
+    results = [
+        test_ttl(),
+        test_lru_eviction(),
+        test_coalescing(),
+        test_cancelled_caller(),
+        test_failures_not_cached(),
+    ]
+
+    print("\n" + "=" * 60)
+    if all(results):
+        print("✓ ALL TESTS PASSED")
+        sys.exit(0)
+    else:
+        print("✗ SOME TESTS FAILED")
+        sys.exit(1)